@@ -1,25 +1,29 @@
 import os
 import sys
+import atexit
+import queue
 import json
 import time
 import random
 import logging
+from logging.handlers import QueueHandler, QueueListener
 import asyncio
 import string
 import re
-from typing import Set, Dict, List, Callable, Optional, Union, Tuple, Any
-from functools import wraps
+from typing import Set, FrozenSet, Dict, List, Callable, Optional, Union, Tuple, Any
+from functools import wraps, lru_cache
+from operator import attrgetter
 from datetime import datetime, timedelta
 from types import SimpleNamespace
-from collections import deque
+from collections import deque, defaultdict
+from itertools import islice
 from telethon import TelegramClient, events
-from telethon.sync import TelegramClient as SyncTelegramClient
 from telethon.tl.functions.channels import JoinChannelRequest, LeaveChannelRequest, GetFullChannelRequest
 from telethon.tl.functions.messages import GetDialogsRequest, SearchGlobalRequest, ImportChatInviteRequest, ForwardMessagesRequest
 from telethon.tl.functions.account import UpdateProfileRequest, UpdateUsernameRequest
 from telethon.tl.functions.photos import UploadProfilePhotoRequest
-from telethon.tl.types import InputPeerEmpty, InputPeerChannel, InputPeerUser, InputPeerChat, Photo
-from telethon.errors import ChatAdminRequiredError, ChatWriteForbiddenError, UserBannedInChannelError, SessionPasswordNeededError
+from telethon.tl.types import InputPeerEmpty, InputPeerChannel, InputPeerUser, InputPeerChat, Photo, PeerUser, PeerChannel, PeerChat
+from telethon.errors import ChatAdminRequiredError, ChatWriteForbiddenError, UserBannedInChannelError, SessionPasswordNeededError, FloodWaitError
 from dotenv import load_dotenv
 
 # Optional imports for enhanced system stats
@@ -33,73 +37,135 @@ except ImportError:
 load_dotenv()
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('telegram_forwarder.log')
-    ]
-)
+# Records go onto a queue and a background listener thread does the console/file writes,
+# so logging never blocks the event loop on disk I/O
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.StreamHandler(), logging.FileHandler('telegram_forwarder.log')]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.SimpleQueue()
+_queue_handler = QueueHandler(_log_queue)
+# Only merge args into the message here; the listener's handlers apply the full format
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 logger = logging.getLogger(__name__)
 
+# Credentials and admin IDs are read from the environment once at import time
+def _parse_int_env(name: str) -> int:
+    """Parse an integer environment variable, logging and returning 0 if it is malformed"""
+    raw = os.getenv(name, '').strip()
+    if not raw:
+        return 0
+    try:
+        return int(raw)
+    except ValueError:
+        logger.error(f"Invalid integer in {name}: {raw!r}")
+        return 0
+
+def _parse_admin_ids(raw: str) -> Set[int]:
+    """Parse a comma-separated list of admin IDs, skipping malformed entries"""
+    admin_ids = set()
+    for part in raw.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            admin_ids.add(int(part))
+        except ValueError:
+            logger.error(f"Ignoring invalid admin ID in ADMIN_USER_IDS: {part!r}")
+    return admin_ids
+
+TELEGRAM_API_ID = _parse_int_env('TELEGRAM_API_ID')
+TELEGRAM_API_HASH = os.getenv('TELEGRAM_API_HASH', '')
+TELEGRAM_PHONE = os.getenv('TELEGRAM_PHONE', '')
+ADMIN_USER_IDS = frozenset(_parse_admin_ids(os.getenv('ADMIN_USER_IDS', '')))
+
+# Seconds during which repeated commands in the same chat don't get another "offline" reply
+OFFLINE_NOTICE_COOLDOWN = 10
+
+# Sender ID accessors tried in order by admin_only; the first one that resolves wins
+_SENDER_GETTERS = (
+    attrgetter('message.from_id.user_id'),
+    attrgetter('from_id.user_id'),
+    attrgetter('message.sender_id'),
+    attrgetter('sender_id'),
+)
+
 def admin_only(func: Callable):
     """Decorator to restrict commands to admin users only"""
+    # Resolved once at decoration time rather than on every call
+    command_function_name = func.__name__
+    is_start_function = command_function_name == "cmd_start"
+
     @wraps(func)
     async def wrapper(self, event, *args, **kwargs):
         try:
             # Get the command name from the event text for logging
-            command_name = event.text.split()[0].lower() if event.text else ""
-            command_function_name = func.__name__
-            logger.info(f"Received command: {command_name}, function: {command_function_name}")
+            command_name = event.text.split(maxsplit=1)[0].lower() if event.text else ""
+            logger.info("Received command: %s, function: %s", command_name, command_function_name)
 
             # Special case: Allow /start command even when bot is disabled
-            is_start_command = command_function_name == "cmd_start" or command_name == "/start"
+            is_start_command = is_start_function or command_name == "/start"
 
             # Get sender ID from event with multiple fallbacks
             sender = None
-            if hasattr(event.message, 'from_id'):
-                sender = event.message.from_id.user_id
-            elif hasattr(event, 'from_id'):
-                sender = event.from_id.user_id
-            elif hasattr(event.message, 'sender_id'):
-                sender = event.message.sender_id
-            elif hasattr(event, 'sender_id'):
-                sender = event.sender_id
+            for get_sender in _SENDER_GETTERS:
+                try:
+                    sender = get_sender(event)
+                except AttributeError:
+                    continue
+                if sender is not None:
+                    break
 
             if sender is None:
-                logger.error(f"Could not determine sender ID for command {command_name}")
+                logger.error("Could not determine sender ID for command %s", command_name)
                 return None
 
             # Log admin check
-            logger.info(f"Checking if user {sender} is admin for command {command_name}")
+            logger.info("Checking if user %s is admin for command %s", sender, command_name)
 
-            # Check if sender is in admin list
-            if sender not in self.admins:
-                logger.warning(f"Unauthorized access attempt from user {sender} for command {command_name}")
+            # Check if sender is in admin list (frozenset, constant-time lookup)
+            admins = self.admins
+            if sender not in admins:
+                logger.warning("Unauthorized access attempt from user %s for command %s", sender, command_name)
                 # Silently ignore unauthorized users
                 return None
 
             # SPECIAL HANDLING FOR /START COMMAND WHEN BOT IS OFFLINE
             if is_start_command and not self.forwarding_enabled:
-                logger.info(f"Received /start command from admin when bot was offline")
-                logger.info(f"Executing start command...")
+                logger.info("Received /start command from admin when bot was offline")
+                logger.info("Executing start command...")
                 return await func(self, event, *args, **kwargs)
 
             # If the bot is not active (disabled) and this isn't the /start command, ignore it
             if not self.forwarding_enabled:
-                logger.info(f"Bot not active. Command: {command_name}, Function: {command_function_name}")
+                logger.info("Bot not active. Command: %s, Function: %s", command_name, command_function_name)
                 # Only send the message if it's not a silent command (system might send multiple commands)
                 if not command_name.startswith("/silent"):
-                    logger.info(f"Sending offline message for command {command_name}")
+                    # Send at most one offline notice per chat per cooldown window
+                    now = time.monotonic()
+                    last_notice = self._offline_notices.get(event.chat_id)
+                    if last_notice is not None and now - last_notice < OFFLINE_NOTICE_COOLDOWN:
+                        logger.info("Skipping duplicate offline message for command %s", command_name)
+                        return None
+                    # Drop expired entries so the map only holds chats inside their cooldown
+                    for chat_id in [c for c, t in self._offline_notices.items() if now - t >= OFFLINE_NOTICE_COOLDOWN]:
+                        del self._offline_notices[chat_id]
+                    self._offline_notices[event.chat_id] = now
+                    logger.info("Sending offline message for command %s", command_name)
                     await event.reply("⚠️ --Ꮪɪᴍṗʟᴇ'𝚜 𝙰𝙳𝙱𝙾𝚃 is currently offline! Use `/start` command to wake it up. 🚀")
                 return None
 
-            logger.info(f"Admin command authorized for user {sender}")
+            logger.info("Admin command authorized for user %s", sender)
             return await func(self, event, *args, **kwargs)
         except Exception as e:
-            logger.error(f"Error in admin_only decorator: {str(e)}")
+            logger.error("Error in admin_only decorator: %s", e)
             # Don't try to reply on errors
             return None
     return wrapper
@@ -110,10 +176,11 @@ def generate_campaign_id(length=1):
         return str(random.randint(1, 9))
     else:
         chars = string.ascii_uppercase + string.digits
-        return ''.join(random.choice(chars) for _ in range(length))
+        return ''.join(random.choices(chars, k=length))
 
+@lru_cache(maxsize=4096)
 def format_time_remaining(seconds: int) -> str:
-    """Format seconds into readable time"""
+    """Format seconds into readable time (memoized - monitors format the same values every tick)"""
     if seconds < 60:
         return f"{seconds}s"
     minutes, seconds = divmod(seconds, 60)
@@ -125,6 +192,230 @@ def format_time_remaining(seconds: int) -> str:
     days, hours = divmod(hours, 24)
     return f"{days}d {hours}h"
 
+def format_elapsed(start_time: float, now: float) -> str:
+    """Format the time elapsed between two timestamps"""
+    return format_time_remaining(int(now - start_time))
+
+def _bar(pct: int, label: str = "LOADING", icon: str = "⚡") -> str:
+    """One frame of the boxed start/stop progress animation"""
+    filled = pct // 10
+    return (
+        f"╔═══════ {label} ═══════╗\n"
+        f"║    {icon} {'■' * filled}{'□' * (10 - filled)} {f'{pct}%':<6}║\n"
+        "╚═════════════════════╝"
+    )
+
+# Frames of the /start loading and /stop shutdown animations, built once at import
+_START_FRAMES = tuple(_bar(pct) for pct in range(0, 101, 10)) + (
+    "╔══════ COMPLETED ═══════╗\n║     ✨ SUCCESS! ✨      ║\n╚═════════════════════╝",
+)
+_SHUTDOWN_FRAMES = tuple(_bar(pct, "SHUTDOWN", "🔴") for pct in range(100, -1, -10)) + (
+    "╔══════ TERMINATED ══════╗\n║      💤 OFFLINE 💤      ║\n╚═════════════════════╝",
+)
+
+# /help loading steps
+_HELP_FRAMES = (
+    "🔄 Loading Command Center...",
+    "⚡ Initializing Help System...",
+    "🔍 Gathering Commands...",
+    "📝 Formatting Guide...",
+    "✨ Preparing Display...",
+)
+
+# /optimize reset phases and its closing frames
+_OPTIMIZE_PHASES = (
+    "🚀 SYSTEM RESET IN PROGRESS\n\n⚡ Phase 1: Analyzing System...",
+    "🚀 SYSTEM RESET IN PROGRESS\n\n⚡ Phase 2: Preparing for Reset...",
+    "🚀 SYSTEM RESET IN PROGRESS\n\n⚡ Phase 3: Backing Up Critical Data...",
+    "🚀 SYSTEM RESET IN PROGRESS\n\n⚡ Phase 4: Clearing All Data...",
+    "🚀 SYSTEM RESET IN PROGRESS\n\n⚡ Phase 5: Finalizing Reset...",
+)
+_RESET_FRAMES = (
+    "🔄 Finalizing Reset...",
+    "✨ Clearing Memory...",
+    "🧹 Cleaning Up...",
+    "🔧 Reconfiguring...",
+    "✅ Reset Complete!",
+)
+
+# Static command texts - {name} and {username} are filled in with str.replace
+_WELCOME_TEMPLATE = """
+╔═══════════════════════════╗
+║  🌟 WELCOME TO THE BEST   ║
+║  --Ꮪɪᴍṗʟᴇ'𝚜 𝙰𝙳𝙱𝙾𝚃 #1   ║
+║       @{username}         ║
+╚═══════════════════════════╝
+
+💫 Hey {name}! Ready to experience the ULTIMATE automation? 💫
+
+I am --Ꮪɪᴍṗʟᴇ'𝚜 𝙰𝙳𝙱𝙾𝚃, your ultimate Telegram assistant, built to make your experience smarter, faster, and way more fun! 🎭⚡
+
+💎 What I Can Do: 
+✅ Fast & Smart Automation ⚡ 
+✅ Fun Commands & Tools 🎭 
+✅ Instant Replies & Assistance 🤖 
+✅ Custom Features Just for You! 💡
+
+🎯 How to Use Me? 
+🔹 Type `/help` to explore my powers! 
+🔹 Want to chat? Just send a message & see the magic! 
+🔹 Feeling bored? Try my fun commands and enjoy the ride!
+
+💬 Mood: Always ready to assist! 
+⚡ Speed: Faster than light! 
+🎭 Vibe: Smart, cool & interactive!
+
+I'm here to make your Telegram experience legendary! 🚀💙 Stay awesome, and let's get started! 😎🔥
+"""
+
+_STOP_TEMPLATE = """⚠️ --Ꮪɪᴍṗʟᴇ'𝚜 𝙰𝙳𝙱𝙾𝚃 SYSTEM SHUTDOWN ⚠️
+
+Hey {name}! 😔 Looks like you've decided to stop me... but don't worry, I'll be here whenever you need me! 🚀
+
+📌 Bot Status: ⚠️ Going Offline for You
+📌 Commands Disabled: ❌ No More Assistance
+📌 Mood: 💤 Entering Sleep Mode
+
+💡 Want to wake me up again?
+Just type `/start`, and I'll be back in action, ready to assist you! 🔥
+
+Until then, stay awesome & take care! 😎
+
+🚀 Powered by --Ꮪɪᴍṗʟᴇ'𝚜 𝙰𝙳𝙱𝙾𝚃 (@siimplebot1)
+"""
+
+_HELP_TEMPLATE = """🚀🔥 WELCOME TO --Ꮪɪᴍṗʟᴇ'𝚜 𝙰𝙳𝙱𝙾𝚃 COMMAND CENTER 🔥🚀
+
+Hey {name}! 😎 Ready to take control? Here's what I can do for you! ⚡
+
+━━━━━━━━━━━━━━━━━━━━━━
+
+🌟 BASIC COMMANDS
+🔹 `/start` – 🚀 Activate the bot
+🔹 `/stop` – 🛑 Deactivate the bot
+🔹 `/help` – 📜 Show all available commands
+🔹 `/client` – 🤖 Get details about your client
+🔹 `/optimize` – 🚀 Reset and optimize performance
+🔹 `/optimize --fast` – ⚡ Optimize with fast mode (no delays)
+🔹 `/refreshme` – 🔄 Reload your account details after changing them
+
+━━━━━━━━━━━━━━━━━━━━━━
+
+📢 ADVERTISEMENT MANAGEMENT
+📌 Run powerful ad campaigns with ease!
+🔹 `/setad` <reply to message> – 📝 Set an ad
+🔹 `/listad` – 📋 View all ads
+🔹 `/removead` <ID> – ❌ Remove a specific ad
+🔹 `/startad` <ID> <interval> – 🚀 Start an ad campaign
+🔹 `/stopad` <ID> – ⏹ Stop an ad campaign
+🔹 `/timer` <seconds> – ⏱️ Set default forward interval
+🔹 `/schedule` <msg_id> <time> – 📆 Schedule a message
+
+━━━━━━━━━━━━━━━━━━━━━━
+
+🎯 TARGETING & AUDIENCE MANAGEMENT
+📌 Reach the right audience with precision!
+🔹 `/addtarget` <targets> – ➕ Add target audience
+🔹 `/listtarget` – 📜 View all targets
+🔹 `/removetarget` <id 1,2,3> – ❌ Remove specific targets
+🔹 `/removealltarget` – 🧹 Clear all targets
+🔹 `/cleantarget` – ✨ Clean up target list
+
+━━━━━━━━━━━━━━━━━━━━━━
+
+🏠 GROUP & CHAT MANAGEMENT
+📌 Effortlessly manage groups and chats!
+🔹 `/joinchat` <chats> – 🔗 Join a chat/group
+🔹 `/leavechat` <chats> – 🚪 Leave a chat/group
+🔹 `/leaveallchat` – 🧹 Leave all groups and channels
+🔹 `/listjoined` – 📋 View joined groups
+🔹 `/listjoined --all` – 📜 View all targeted joined groups
+🔹 `/clearchat` [count] – 🧹 Clear messages
+🔹 `/pin` [silent] – 📌 Pin a message silently
+
+━━━━━━━━━━━━━━━━━━━━━━
+
+👤 USER PROFILE & CUSTOMIZATION
+📌 Make your profile stand out!
+🔹 `/bio` <text> – 📝 Set a new bio
+🔹 `/name` <first_name> <last_name> – 🔄 Change your name
+🔹 `/username` <new_username> – 🔀 Change your username
+🔹 `/setpic` – 🖼 Set profile picture
+
+━━━━━━━━━━━━━━━━━━━━━━
+
+🔑 ADMIN CONTROLS
+📌 Manage bot admins easily!
+🔹 `/addadmin` <user_id> <username> – ➕ Add an admin
+🔹 `/removeadmin` <user_id> <username> – ❌ Remove an admin
+🔹 `/listadmins` – 📜 View all admins
+
+━━━━━━━━━━━━━━━━━━━━━━
+
+📊 MONITORING
+📌 Track your campaigns!
+🔹 `/monitor` – 📊 Show campaign dashboard
+🔹 `/failedchats` – 📋 View chats with failed deliveries
+🔹 `/retryfailed` – 🔄 Retry sending to failed chats
+🔹 `/removefailed` – 🧹 Clear failed chats list
+
+━━━━━━━━━━━━━━━━━━━━━━
+
+💡 Need Help?
+Type `/help` anytime to get assistance!
+
+━━━━━━━━━━━━━━━━━━━━━━
+
+🔥 Powered by --Ꮪɪᴍṗʟᴇ'𝚜 𝙰𝙳𝙱𝙾𝚃 (@{username})
+
+🚀 Stay Smart, Stay Automated!
+"""
+
+# Telegram's message length limit, and how much of it truncated text may use
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+MAX_LEN = TELEGRAM_MAX_MESSAGE_LENGTH - 100
+_TRUNCATION_NOTICE = "\n\n... (message truncated due to length) ...\n"
+
+def _safe_truncate(text: str, limit: int = MAX_LEN) -> str:
+    """Cut text to at most `limit` chars at a line break, so no line or emoji is split"""
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    head, sep, _ = cut.rpartition('\n')
+    return (head if sep else cut) + _TRUNCATION_NOTICE
+
+# Positive-feedback words that make a reaction more likely (one case-insensitive scan per message)
+_POSITIVE_WORDS_RE = re.compile(r"thank|good|great|awesome", re.IGNORECASE)
+
+# Common keywords to topics mapping used by HumanBehaviorManager._extract_topics
+_KEYWORD_TOPICS = {
+    "help": "assistance",
+    "start": "onboarding",
+    "target": "advertising",
+    "ad": "advertising",
+    "command": "functionality",
+    "error": "troubleshooting"
+}
+
+# Time-of-day delay factor range for each hour (index 0-23)
+_HOUR_DELAY_FACTORS = tuple(
+    (1.2, 1.5) if hour < 6 else   # Late night - slower responses (less active)
+    (0.8, 1.2) if hour < 9 else   # Early morning - moderate response times
+    (0.6, 1.0) if hour < 18 else  # Working hours - faster
+    (0.7, 1.1) if hour < 22 else  # Evening - moderate
+    (0.9, 1.3)                    # Night - slightly slower
+    for hour in range(24)
+)
+
+# Time-appropriate greeting for each hour (index 0-23)
+_GREETINGS_BY_HOUR = tuple(
+    "Good morning! How can I assist you today?" if 5 <= hour < 12 else
+    "Good afternoon! What can I help you with?" if 12 <= hour < 17 else
+    "Good evening! How may I be of service?" if 17 <= hour < 22 else
+    "Hello there! Even at this late hour, I'm here to help."
+    for hour in range(24)
+)
+
 class HumanBehaviorManager:
     """
     Manages human-like behavior patterns for the bot
@@ -133,6 +424,10 @@ class HumanBehaviorManager:
     def __init__(self):
         # History of recent actions to inform behavior decisions
         self.recent_actions = deque(maxlen=10)
+        # (action number, monotonic time) of recent reactions, pruned from the left once they
+        # age out or fall out of the recent_actions window
+        self._reaction_times = deque(maxlen=10)
+        self._action_count = 0
         # Base delay ranges in seconds 
         self.base_delay_ranges = {
             "message": (60, 90),         # Regular message sending delay (60-90 sec)
@@ -159,6 +454,9 @@ class HumanBehaviorManager:
             "time": now,
             "details": details
         })
+        self._action_count += 1
+        if action_type == "reaction":
+            self._reaction_times.append((self._action_count, time.monotonic()))
         
         # Update consecutive action tracking
         if self.last_action_type == action_type:
@@ -183,22 +481,8 @@ class HumanBehaviorManager:
             base_max = min(base_max * consecutive_factor, 180)  # Cap at 3 minutes
         
         # Factor in time of day
-        hour_now = datetime.now().hour
-        if hour_now >= 0 and hour_now < 6:  # Late night
-            # Slower responses late at night (less active)
-            time_of_day_factor = random.uniform(1.2, 1.5)
-        elif hour_now >= 6 and hour_now < 9:  # Early morning
-            # Moderate response times in early morning
-            time_of_day_factor = random.uniform(0.8, 1.2)
-        elif hour_now >= 9 and hour_now < 18:  # Working hours
-            # Faster during working hours
-            time_of_day_factor = random.uniform(0.6, 1.0)
-        elif hour_now >= 18 and hour_now < 22:  # Evening
-            # Moderate in evening
-            time_of_day_factor = random.uniform(0.7, 1.1)
-        else:  # Night
-            # Slightly slower at night
-            time_of_day_factor = random.uniform(0.9, 1.3)
+        factor_min, factor_max = _HOUR_DELAY_FACTORS[time.localtime().tm_hour]
+        time_of_day_factor = random.uniform(factor_min, factor_max)
             
         # Apply all factors to calculate final delay
         min_delay = base_min * time_of_day_factor
@@ -213,9 +497,8 @@ class HumanBehaviorManager:
         
     def _weighted_random(self, min_val, max_val):
         """Generate a random number with slight weighting toward middle values"""
-        # Take multiple samples and average them to create a more natural distribution
-        samples = [random.uniform(min_val, max_val) for _ in range(3)]
-        return sum(samples) / len(samples)
+        # Triangular distribution peaks at the midpoint, close to averaging several uniform samples
+        return random.triangular(min_val, max_val)
     
     def get_human_typing_duration(self, text_length):
         """Calculate realistic typing time based on message length"""
@@ -240,7 +523,7 @@ class HumanBehaviorManager:
         base_probability = 0.3
         
         # Increase probability based on message characteristics
-        if content and any(word in content.lower() for word in ["thank", "thanks", "good", "great", "awesome"]):
+        if content and _POSITIVE_WORDS_RE.search(content):
             base_probability += 0.4
         elif message_type == "photo":
             base_probability += 0.3
@@ -248,9 +531,13 @@ class HumanBehaviorManager:
             base_probability += 0.5
             
         # Reduce probability if we've reacted to several messages recently
-        reaction_count = sum(1 for action in self.recent_actions 
-                           if action["type"] == "reaction" and 
-                           (datetime.now() - action["time"]).total_seconds() < 300)
+        # (among the last recent_actions.maxlen actions, within 5 minutes)
+        now = time.monotonic()
+        oldest_recent = self._action_count - self.recent_actions.maxlen
+        reaction_times = self._reaction_times
+        while reaction_times and (reaction_times[0][0] <= oldest_recent or now - reaction_times[0][1] >= 300):
+            reaction_times.popleft()
+        reaction_count = len(reaction_times)
         if reaction_count > 2:
             base_probability -= 0.15 * (reaction_count - 2)
             
@@ -295,28 +582,22 @@ class HumanBehaviorManager:
     def _extract_topics(self, messages):
         """Extract main topics from recent messages"""
         # Simple topic extraction - in a real implementation this would be more sophisticated
-        topics = []
-        
-        # Common keywords to topics mapping
-        keyword_topics = {
-            "help": "assistance",
-            "start": "onboarding",
-            "target": "advertising",
-            "ad": "advertising",
-            "command": "functionality",
-            "error": "troubleshooting"
-        }
+        # Ordered dict keys keep first-seen order while de-duplicating topics
+        topics = {}
         
-        # Extract topics based on keywords
+        # Extract topics based on keywords, lowercasing each message once.
+        # A substring test per keyword still catches overlapping keywords
+        # (e.g. "startarget") and keeps _KEYWORD_TOPICS order within a message.
         for message in messages:
             if not message:
                 continue
                 
-            for keyword, topic in keyword_topics.items():
-                if keyword in message.lower() and topic not in topics:
-                    topics.append(topic)
+            lowered = message.lower()
+            for keyword, topic in _KEYWORD_TOPICS.items():
+                if keyword in lowered:
+                    topics.setdefault(topic, None)
                     
-        return topics
+        return list(topics)
         
     def _generate_question_response(self, topics, context):
         """Generate a smart response to a question"""
@@ -330,16 +611,7 @@ class HumanBehaviorManager:
             
     def _generate_greeting_response(self):
         """Generate a time-appropriate greeting"""
-        hour = datetime.now().hour
-        
-        if hour >= 5 and hour < 12:
-            return "Good morning! How can I assist you today?"
-        elif hour >= 12 and hour < 17:
-            return "Good afternoon! What can I help you with?"
-        elif hour >= 17 and hour < 22:
-            return "Good evening! How may I be of service?"
-        else:
-            return "Hello there! Even at this late hour, I'm here to help."
+        return _GREETINGS_BY_HOUR[time.localtime().tm_hour]
             
     def _generate_help_response(self, topics):
         """Generate a contextual help suggestion"""
@@ -350,6 +622,74 @@ class HumanBehaviorManager:
         else:
             return "Use /help to see all available commands, or tell me what you're trying to accomplish."
 
+# Private forum topic links: t.me/c/<channel_id>/<topic_id>
+_TME_C_TOPIC_RE = re.compile(r't\.me/c/(\d+)/(\d+)')
+# Public forum topic links: t.me/<channel>/<topic_id>
+_TME_TOPIC_RE = re.compile(r't\.me/([^/]+)/(\d+)')
+
+# Peer class -> (entity type, attribute holding the numeric ID)
+_PEER_TYPES = {
+    PeerUser: ("user", "user_id"),
+    PeerChannel: ("channel", "channel_id"),
+    PeerChat: ("chat", "chat_id"),
+    InputPeerUser: ("user", "user_id"),
+    InputPeerChannel: ("channel", "channel_id"),
+    InputPeerChat: ("chat", "chat_id"),
+}
+
+def peer_to_id_and_type(peer):
+    """Return (entity_id, entity_type) for a Peer/InputPeer object, or (None, "unknown") for anything else"""
+    peer_type = _PEER_TYPES.get(type(peer))
+    if peer_type is None:
+        return None, "unknown"
+    entity_type, id_attr = peer_type
+    return getattr(peer, id_attr), entity_type
+
+# Cache of {id(client): (built_at_monotonic, {username_lower: entity})} for username lookups
+_dialog_index_cache: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+DIALOG_INDEX_TTL = 300  # Seconds before the dialog username index is rebuilt
+
+async def get_dialog_username_index(client, ttl: int = DIALOG_INDEX_TTL, refresh: bool = False) -> Dict[str, Any]:
+    """
+    Return a {username_lower: entity} index of the client's recent dialogs
+    The index is built from one iter_dialogs pass and reused until it is older than ttl seconds
+    """
+    cached = _dialog_index_cache.get(id(client))
+    if cached and not refresh and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+
+    index = {}
+    async for dialog in client.iter_dialogs(limit=200):
+        # ChannelForbidden and other entities without a username can't be looked up by name
+        username = getattr(dialog.entity, 'username', None)
+        if username:
+            index[username.lower()] = dialog.entity
+
+    _dialog_index_cache[id(client)] = (time.monotonic(), index)
+    return index
+
+def remember_dialog_entities(client, chats):
+    """Add just-joined chats to the cached username index so they resolve without a rebuild"""
+    cached = _dialog_index_cache.get(id(client))
+    if not cached:
+        return
+    for chat in chats:
+        username = getattr(chat, 'username', None)
+        if username:
+            cached[1][username.lower()] = chat
+
+async def lookup_input_peer(client, entity_reference):
+    """
+    Resolve a reference with get_input_entity, which answers from the session cache when it can
+    Returns (entity_id, entity_type), or (None, "unknown") if Telegram can't resolve it this way
+    """
+    try:
+        input_peer = await client.get_input_entity(entity_reference)
+    except Exception as e:
+        logger.debug(f"get_input_entity could not resolve {entity_reference}: {e}")
+        return None, "unknown"
+    return peer_to_id_and_type(input_peer)
+
 async def resolve_entity_without_get_entity(client, entity_reference):
     """
     Resolve an entity reference (username, ID, link) to a numeric ID without using get_entity
@@ -372,20 +712,16 @@ async def resolve_entity_without_get_entity(client, entity_reference):
     topic_id = None
     
     # Handle forum topic links (t.me/c/channel_id/topic_id format)
-    if isinstance(entity_reference, str) and 't.me/c/' in entity_reference:
-        try:
-            # Extract channel ID and topic ID from the URL
-            parts = entity_reference.split('t.me/c/')[-1].split('/')
-            if len(parts) >= 2:
-                # First part is channel ID, second part is topic ID
-                channel_id = int(parts[0])
-                topic_id = int(parts[1])
-                
-                logger.info(f"Resolved forum topic link: channel_id={channel_id}, topic_id={topic_id}")
-                return channel_id, "topic", f"Forum Topic {topic_id}", topic_id
-        except Exception as e:
-            logger.error(f"Error parsing forum topic link {entity_reference}: {e}")
-            # Fall through to other methods
+    if isinstance(entity_reference, str):
+        topic_match = _TME_C_TOPIC_RE.search(entity_reference)
+        if topic_match:
+            # First group is channel ID, second group is topic ID
+            channel_id = int(topic_match.group(1))
+            topic_id = int(topic_match.group(2))
+            
+            logger.info(f"Resolved forum topic link: channel_id={channel_id}, topic_id={topic_id}")
+            return channel_id, "topic", f"Forum Topic {topic_id}", topic_id
+        # Anything else (including malformed t.me/c/ links) falls through to other methods
     
     # Already a numeric ID
     if isinstance(entity_reference, int):
@@ -399,44 +735,34 @@ async def resolve_entity_without_get_entity(client, entity_reference):
     if isinstance(entity_reference, str) and entity_reference.startswith('@'):
         username = entity_reference[1:]  # Strip @ symbol
         
-        # Try finding in dialogs first (faster and more reliable)
-        async for dialog in client.iter_dialogs(limit=200):
-            # Check if entity is ChannelForbidden and handle it specially
-            if hasattr(dialog, 'entity') and hasattr(dialog.entity, '__class__') and dialog.entity.__class__.__name__ == 'ChannelForbidden':
-                # For forbidden channels, we can still get the ID but not much else
-                entity_type = "channel"
-                entity_name = f"Forbidden Channel {dialog.entity.id}"
-                return dialog.entity.id, entity_type, entity_name, None
-                
-            # Normal case: check for matching username
-            if hasattr(dialog.entity, 'username') and dialog.entity.username and dialog.entity.username.lower() == username.lower():
-                if hasattr(dialog.entity, 'first_name'):
-                    entity_type = "user"
-                    entity_name = dialog.entity.first_name
-                elif hasattr(dialog.entity, 'title'):
-                    if hasattr(dialog.entity, 'broadcast') and dialog.entity.broadcast:
-                        entity_type = "channel" 
-                    else:
-                        entity_type = "chat"
-                    entity_name = dialog.entity.title
-                
-                return dialog.entity.id, entity_type, entity_name, None
+        # Try finding in the cached dialog index first (faster and more reliable)
+        dialog_index = await get_dialog_username_index(client)
+        entity = dialog_index.get(username.lower())
+        if entity is not None:
+            if hasattr(entity, 'first_name'):
+                entity_type = "user"
+                entity_name = entity.first_name
+            elif hasattr(entity, 'title'):
+                if hasattr(entity, 'broadcast') and entity.broadcast:
+                    entity_type = "channel" 
+                else:
+                    entity_type = "chat"
+                entity_name = entity.title
+            
+            return entity.id, entity_type, entity_name, None
+        
+        # Next try the session cache / a single username lookup - no message sent
+        entity_id, entity_type = await lookup_input_peer(client, entity_reference)
+        if entity_id is not None:
+            return entity_id, entity_type, entity_name, None
         
-        # If not found in dialogs, try sending a message
+        # If still not found, try sending a message
         try:
             # Send a temporary message to get the entity ID
             temp_msg = await client.send_message(entity_reference, ".")
             
             # Extract ID based on peer_id type
-            if hasattr(temp_msg.peer_id, 'user_id'):
-                entity_id = temp_msg.peer_id.user_id
-                entity_type = "user"
-            elif hasattr(temp_msg.peer_id, 'channel_id'):
-                entity_id = temp_msg.peer_id.channel_id
-                entity_type = "channel"
-            elif hasattr(temp_msg.peer_id, 'chat_id'):
-                entity_id = temp_msg.peer_id.chat_id
-                entity_type = "chat"
+            entity_id, entity_type = peer_to_id_and_type(temp_msg.peer_id)
             
             # Delete the temporary message
             await temp_msg.delete()
@@ -444,7 +770,9 @@ async def resolve_entity_without_get_entity(client, entity_reference):
             
         except Exception as e:
             logger.error(f"Error resolving username {entity_reference}: {e}")
-            # Fall through to other methods
+        
+        # The username was already looked up above - don't resolve it again
+        raise ValueError(f"Could not resolve entity: {entity_reference}")
     
     # Handle t.me links
     if isinstance(entity_reference, str) and ('t.me/' in entity_reference):
@@ -455,20 +783,17 @@ async def resolve_entity_without_get_entity(client, entity_reference):
         except Exception as e:
             logger.debug(f"Couldn't join {entity_reference}: {e}")
         
+        # Try resolving without posting anything first
+        entity_id, entity_type = await lookup_input_peer(client, entity_reference)
+        if entity_id is not None:
+            return entity_id, entity_type, entity_name, None
+        
         # Try sending a message to get ID
         try:
             temp_msg = await client.send_message(entity_reference, ".")
             
             # Extract ID based on peer_id type
-            if hasattr(temp_msg.peer_id, 'user_id'):
-                entity_id = temp_msg.peer_id.user_id
-                entity_type = "user"
-            elif hasattr(temp_msg.peer_id, 'channel_id'):
-                entity_id = temp_msg.peer_id.channel_id
-                entity_type = "channel"
-            elif hasattr(temp_msg.peer_id, 'chat_id'):
-                entity_id = temp_msg.peer_id.chat_id
-                entity_type = "chat"
+            entity_id, entity_type = peer_to_id_and_type(temp_msg.peer_id)
                 
             # Delete the temporary message
             await temp_msg.delete()
@@ -476,22 +801,20 @@ async def resolve_entity_without_get_entity(client, entity_reference):
             
         except Exception as e:
             logger.error(f"Error resolving link {entity_reference}: {e}")
+        
+        raise ValueError(f"Could not resolve entity: {entity_reference}")
+    
+    # For bare identifiers only, try resolving without posting anything first
+    entity_id, entity_type = await lookup_input_peer(client, entity_reference)
+    if entity_id is not None:
+        return entity_id, entity_type, entity_name, None
     
-    # For any other string format
     try:
         # Last attempt - direct message send
         temp_msg = await client.send_message(entity_reference, ".")
         
         # Extract ID based on peer_id type
-        if hasattr(temp_msg.peer_id, 'user_id'):
-            entity_id = temp_msg.peer_id.user_id
-            entity_type = "user"
-        elif hasattr(temp_msg.peer_id, 'channel_id'):
-            entity_id = temp_msg.peer_id.channel_id
-            entity_type = "channel"
-        elif hasattr(temp_msg.peer_id, 'chat_id'):
-            entity_id = temp_msg.peer_id.chat_id
-            entity_type = "chat"
+        entity_id, entity_type = peer_to_id_and_type(temp_msg.peer_id)
             
         # Delete the temporary message
         await temp_msg.delete()
@@ -506,35 +829,131 @@ async def resolve_entity_without_get_entity(client, entity_reference):
         
     return entity_id, entity_type, entity_name, None
 
+# Telegram flood errors read "A wait of N seconds is required"; compiled once for every monitor
+_FLOOD_WAIT_RE = re.compile(r'of (\d+) seconds')
+
+# Fixed section headers of the monitor and dashboard texts
+_HDR_STATS = "📈 LIVE Statistics:\n"
+_HDR_PROGRESS = "🔄 Progress:\n"
+_HDR_TIMING = "\n⏰ Timing:\n"
+_HDR_FINAL_STATS = "📈 Final Statistics:\n"
+_HDR_FINAL_PROGRESS = "🔄 Final Progress:\n"
+_HDR_TOTAL_STATS = "📈 **TOTAL STATISTICS:**\n"
+
+class MonitorHandle:
+    """Message a live monitor edits; slotted since one exists per monitored campaign"""
+    __slots__ = ('message', 'chat_id', 'stop')
+
+    def __init__(self, message, chat_id):
+        self.message = message
+        self.chat_id = chat_id
+        # Set to tell the monitor task to finish right away
+        self.stop = asyncio.Event()
+
 class MonitorDashboard:
     """Live monitoring dashboard for ad campaigns"""
+
+    # Minimum seconds between any two monitor edits across all campaigns
+    MONITOR_EDIT_MIN_GAP = 1.0
+    # How many times the final summary edit is retried after a flood wait
+    FINAL_EDIT_MAX_RETRIES = 2
+
+    # Campaign fields the live monitor reads, with their defaults, in snapshot order
+    # (None for the timestamps means "now")
+    _CAMPAIGN_FIELDS = (
+        ('status', 'Unknown'),
+        ('total_sent', 0),
+        ('failed_sends', 0),
+        ('rounds_completed', 0),
+        ('last_round_success', 0),
+        ('current_failures', {}),
+        ('targets', 0),
+        ('msg_id', 'unknown'),
+        ('interval', 0),
+        ('start_time', None),
+        ('next_round_time', None),
+        ('progress', 'Sending in progress...'),
+    )
+
+    # (keyword, label) pairs checked in order against the lowercased failure reason
+    _ERROR_LABELS = (
+        ("banned", "BANNED ⛔"),
+        ("permission", "NO PERMISSION ⚠️"),
+        ("private", "PRIVATE CHANNEL 🔒"),
+        ("not found", "CHAT NOT FOUND 🔍"),
+        ("too many", "RATE LIMITED ⏱️"),
+        ("rate limit", "RATE LIMITED ⏱️"),
+    )
+
     def __init__(self, forwarder):
         self.forwarder = forwarder
         self.campaigns = {}
-        self.active_monitors = {}
+        self.active_monitors: Dict[str, MonitorHandle] = {}
+        # IDs of campaigns whose status is 'running', maintained on every status change
+        self._running_ids: Set[str] = set()
+        # Running live monitor tasks (the event loop only keeps weak references to tasks)
+        self._monitor_tasks: Set[asyncio.Task] = set()
+        # Per-campaign "data changed" events, so live monitors only redraw when there is news
+        self._dirty: Dict[str, asyncio.Event] = {}
+        # All monitors edit through the same session, so edits go out one at a time
+        # with at least MONITOR_EDIT_MIN_GAP seconds between them
+        self._edit_semaphore = asyncio.Semaphore(1)
+        self._last_edit_time = 0.0
         logger.info("Monitor initialized")
 
+    def _mark_dirty(self, campaign_id):
+        """Wake the live monitor for a campaign, if one is running"""
+        dirty = self._dirty.get(campaign_id)
+        if dirty is not None:
+            dirty.set()
+
+    def _track_running(self, campaign_id):
+        """Keep the running-campaign index in sync after a campaign's status may have changed"""
+        if self.campaigns[campaign_id].get('status') == 'running':
+            self._running_ids.add(campaign_id)
+        else:
+            self._running_ids.discard(campaign_id)
+
     def add_campaign(self, campaign_id, data):
         self.campaigns[campaign_id] = data
+        self._track_running(campaign_id)
+        self._mark_dirty(campaign_id)
 
     def update_campaign(self, campaign_id, updates):
         if campaign_id in self.campaigns:
             self.campaigns[campaign_id].update(updates)
+            if 'status' in updates:
+                self._track_running(campaign_id)
+            self._mark_dirty(campaign_id)
+
+    def increment_campaign(self, campaign_id, sent=0, failed=0, **fields):
+        """Add to a campaign's sent/failed totals and apply other field updates in one call"""
+        campaign = self.campaigns.get(campaign_id)
+        if campaign is None:
+            return
+        campaign['total_sent'] = campaign.get('total_sent', 0) + sent
+        campaign['failed_sends'] = campaign.get('failed_sends', 0) + failed
+        campaign.update(fields)
+        if 'status' in fields:
+            self._track_running(campaign_id)
+        self._mark_dirty(campaign_id)
 
     def update_campaign_status(self, campaign_id, status, extra_data=None):
         if campaign_id in self.campaigns:
             self.campaigns[campaign_id]['status'] = status
             if extra_data:
                 self.campaigns[campaign_id].update(extra_data)
+            self._track_running(campaign_id)
+            self._mark_dirty(campaign_id)
 
     def get_campaign_data(self, campaign_id):
         return self.campaigns.get(campaign_id)
 
     def get_active_campaign_count(self):
-        return len([c for c in self.campaigns.values() if c.get('status') == 'running'])
+        return len(self._running_ids)
 
     def list_active_campaigns(self):
-        return [c_id for c_id, c_data in self.campaigns.items() if c_data.get('status') == 'running']
+        return list(self._running_ids)
 
     def list_campaigns(self):
         return list(self.campaigns.keys())
@@ -549,33 +968,46 @@ class MonitorDashboard:
         return campaign_id in self.active_monitors
 
     async def start_live_monitor(self, campaign_id, message, chat_id):
-        self.active_monitors[campaign_id] = {'message': message, 'chat_id': chat_id}
-        asyncio.create_task(self._live_monitor(campaign_id, message, chat_id))
+        # Only one monitor per campaign - stop any previous one first
+        previous = self.active_monitors.get(campaign_id)
+        if previous is not None:
+            previous.stop.set()
+        handle = MonitorHandle(message, chat_id)
+        self.active_monitors[campaign_id] = handle
+        self._dirty.setdefault(campaign_id, asyncio.Event())
+        # Keep a strong reference so the task can't be garbage-collected mid-run
+        task = asyncio.create_task(self._live_monitor(campaign_id, message, chat_id, handle.stop), name=f"monitor-{campaign_id}")
+        self._monitor_tasks.add(task)
+        task.add_done_callback(self._monitor_tasks.discard)
         return True  # Return a value to make it properly awaitable
     
-    async def _live_monitor(self, campaign_id, message, chat_id):
+    async def _live_monitor(self, campaign_id, message, chat_id, stop):
         """Live monitor a campaign and update the status message regularly with enhanced real-time tracking"""
         try:
-            logger.info(f"Starting enhanced live monitoring for campaign {campaign_id}")
+            logger.info("Starting enhanced live monitoring for campaign %s", campaign_id)
             
             # Adaptive update intervals based on campaign status
             active_update_interval = 2   # Update every 2 seconds when active sending
             waiting_update_interval = 5   # Update every 5 seconds when waiting
+            idle_refresh_interval = 30   # Redraw timers at least this often even when nothing changed
+            min_edit_gap = 5   # Minimum seconds between edits of this monitor, to avoid flood waits
             
-            # Track previous status to detect changes
-            previous_status = None
-            previous_sent = 0
-            previous_failed = 0
+            # Signature of the last values actually shown, to detect changes
+            prev_signature = None
+            
+            # Message/interval/targets block only changes if the campaign is edited, so cache it
+            static_key = None
+            static_block = ""
             
             # Start time for calculations
             monitor_start_time = time.time()
             last_successful_update = time.time()
             update_failures = 0
             
-            while campaign_id in self.active_monitors:
+            while not stop.is_set():
                 # Check if campaign still exists
                 if not self.campaign_exists(campaign_id):
-                    logger.warning(f"Campaign {campaign_id} no longer exists, stopping monitor")
+                    logger.warning("Campaign %s no longer exists, stopping monitor", campaign_id)
                     break
                     
                 # Get current campaign data
@@ -583,183 +1015,155 @@ class MonitorDashboard:
                 
                 # Skip update if campaign data is missing
                 if not campaign_data:
-                    await asyncio.sleep(active_update_interval)
+                    await self._sleep_or_stop(stop, active_update_interval)
                     continue
                 
-                # Get current time for calculations
-                current_time = time.time()
+                # Get current time for calculations - read the clock once per tick
+                now = time.time()
+                
+                # Snapshot every field once so the text below is built from consistent values
+                (status, total_sent, failed_sends, rounds_completed, last_round_success,
+                 current_failures, targets, msg_id, interval, start_time, next_round_time,
+                 progress_text) = self._snapshot_campaign(campaign_data, now)
                 
-                # Format status message with detailed real-time tracking
-                status = campaign_data.get('status', 'Unknown')
-                total_sent = campaign_data.get('total_sent', 0)
-                failed_sends = campaign_data.get('failed_sends', 0)
-                rounds_completed = campaign_data.get('rounds_completed', 0)
-                last_round_success = campaign_data.get('last_round_success', 0)
+                # Nothing shown has changed and the timers were redrawn recently -
+                # skip building the text and the edit (which would only be "not modified")
+                signature = (status, total_sent, failed_sends, rounds_completed, len(current_failures))
+                if signature == prev_signature and now - last_successful_update < idle_refresh_interval:
+                    await self._wait_for_changes(campaign_id, stop, waiting_update_interval, idle_refresh_interval)
+                    continue
                 
-                # Detect if status has changed or messages sent/failed have increased
-                status_changed = status != previous_status
-                sent_increased = total_sent > previous_sent
-                failed_increased = failed_sends > previous_failed
+                # Too soon after the last edit - wait it out before building text that would be discarded
+                time_since_last_update = now - last_successful_update
+                if time_since_last_update < min_edit_gap:
+                    await self._sleep_or_stop(stop, min_edit_gap - time_since_last_update)
+                    continue
+                
+                now_str = time.strftime('%H:%M:%S', time.localtime(now))
                 
                 # Calculate real-time sending rate
-                elapsed_time = current_time - monitor_start_time
+                elapsed_time = now - monitor_start_time
                 if elapsed_time > 0:
                     sending_rate = total_sent / elapsed_time if elapsed_time > 0 else 0
                     sending_rate_text = f"{sending_rate:.2f} msgs/sec" if sending_rate > 0 else "Calculating..."
                 else:
                     sending_rate_text = "Starting..."
                 
-                # Ensure failures are correctly extracted
-                current_failures = campaign_data.get('current_failures', {})
-                if not current_failures and 'current_failures' in campaign_data:
-                    current_failures = campaign_data['current_failures']
-                
-                targets = campaign_data.get('targets', 0)
-                msg_id = campaign_data.get('msg_id', 'unknown')
-                interval = campaign_data.get('interval', 0)
-                start_time = campaign_data.get('start_time', time.time())
-                next_round_time = campaign_data.get('next_round_time', time.time())
-                
                 # Log important statistics for debugging
-                logger.info(f"Monitor data for campaign {campaign_id}: Rounds={rounds_completed}, Sent={total_sent}, Failed={failed_sends}, Failures={len(current_failures)}")
+                logger.info("Monitor data for campaign %s: Rounds=%s, Sent=%s, Failed=%s, Failures=%s", campaign_id, rounds_completed, total_sent, failed_sends, len(current_failures))
                 
-                # Calculate running time
-                running_time = int(time.time() - start_time)
-                running_time_str = format_time_remaining(running_time)
+                # Calculate running time and success rate
+                running_time_str = format_elapsed(start_time, now)
+                success_rate = self._rate(total_sent, failed_sends)
                 
-                # Calculate success rate - ensure it's actually based on total attempted messages
-                success_rate = 0.0
-                if total_sent > 0:  # Only calculate if there were successful deliveries
-                    success_rate = (total_sent / (total_sent + failed_sends)) * 100
-                    # Cap success rate at 100% for logical display
-                    success_rate = min(success_rate, 100.0)
-                
-                # Format interval
-                minutes, seconds = divmod(interval, 60)
-                interval_str = f"{minutes}m {seconds}s"
-                
-                # Get current time
-                current_time = datetime.now().strftime('%H:%M:%S')
+                # Rebuild the static block only when its inputs change
+                if static_key != (msg_id, interval, targets):
+                    static_key = (msg_id, interval, targets)
+                    minutes, seconds = divmod(interval, 60)
+                    static_block = (
+                        f"📨 Message: {msg_id}\n\n"
+                        f"⏱️ Interval: {minutes}m {seconds}s\n\n"
+                        f"🎯 Targets: {targets}\n\n"
+                    )
                 
                 # Determine next run status
-                time_to_next = max(0, int(next_round_time - time.time()))
+                time_to_next = max(0, int(next_round_time - now))
                 next_run_str = "processing now..." if status == "sending" else f"in {format_time_remaining(time_to_next)}"
                 
                 # Convert status to uppercase
                 display_status = status.upper() if status else "UNKNOWN"
                 
-                # Current time for timestamps
-                current_monitor_time = datetime.now().strftime('%H:%M:%S')
+                # Choose update interval based on status - needed up front for the footer
+                update_interval = active_update_interval if status == "sending" else waiting_update_interval
                 
                 # Build the monitor message with real-time indicators
-                status_text = f"📊 LIVE CAMPAIGN MONITOR #{campaign_id}\n\n"
-                status_text += f"🔄 Status: {display_status} @ {current_monitor_time}\n\n"
-                status_text += f"📨 Message: {msg_id}\n\n"
-                status_text += f"⏱️ Interval: {interval_str}\n\n"
-                status_text += f"🎯 Targets: {targets}\n\n"
-                
-                # Enhanced statistics section with real-time indicators
-                status_text += f"📈 LIVE Statistics:\n"
+                parts = [
+                    f"📊 LIVE CAMPAIGN MONITOR #{campaign_id}\n\n",
+                    f"🔄 Status: {display_status} @ {now_str}\n\n",
+                    static_block,
+                    # Enhanced statistics section with real-time indicators
+                    _HDR_STATS,
+                ]
                 
                 # Add real-time indicator with timestamp for sent messages
                 if status == "sending":
-                    status_text += f"   ✅ Sent: {total_sent} (Sending now...)\n"
+                    parts.append(f"   ✅ Sent: {total_sent} (Sending now...)\n")
                 else:
-                    status_text += f"   ✅ Sent: {total_sent}\n"
+                    parts.append(f"   ✅ Sent: {total_sent}\n")
                 
                 # Show last round success count if available
                 if last_round_success > 0:
-                    status_text += f"   ✳️ Last Round: +{last_round_success} sent\n"
+                    parts.append(f"   ✳️ Last Round: +{last_round_success} sent\n")
                 
-                status_text += f"   ❌ Failures: {failed_sends}\n"
-                status_text += f"   📊 Success Rate: {success_rate:.1f}%\n\n"
+                parts.append(f"   ❌ Failures: {failed_sends}\n")
+                parts.append(f"   📊 Success Rate: {success_rate:.1f}%\n\n")
                 
                 # Progress section
-                status_text += f"🔄 Progress:\n"
-                status_text += f"   • Rounds completed: {rounds_completed}\n"
+                parts.append(_HDR_PROGRESS)
+                parts.append(f"   • Rounds completed: {rounds_completed}\n")
                 
                 # Add progress indicator if sending
                 if status == "sending":
-                    # Check if there's a progress field in the campaign data
-                    progress_text = campaign_data.get('progress', 'Sending in progress...')
-                    status_text += f"   • 🔄 {progress_text}\n"
+                    parts.append(f"   • 🔄 {progress_text}\n")
                 
-                status_text += f"\n⏰ Timing:\n"
-                status_text += f"   🟢 Running for: {running_time_str}\n"
-                status_text += f"   ⏩ Next run: {next_run_str}\n\n"
+                parts.append(_HDR_TIMING)
+                parts.append(f"   🟢 Running for: {running_time_str}\n")
+                parts.append(f"   ⏩ Next run: {next_run_str}\n\n")
                 
                 # Add failures if any
                 if current_failures and len(current_failures) > 0:
-                    status_text += f"❌ Current Failures: {len(current_failures)}\n"
+                    parts.append(f"❌ Current Failures: {len(current_failures)}\n")
                     
                     # Limit the number of failures shown to prevent message length issues
                     max_failures_to_show = min(5, len(current_failures))
                     
-                    for i, (target, error) in enumerate(list(current_failures.items())[:max_failures_to_show]):
-                        # Extract ban/error reason more clearly
-                        error_type = "Unknown error"
-                        if "banned" in error.lower():
-                            error_type = "BANNED ⛔"
-                        elif "permission" in error.lower():
-                            error_type = "NO PERMISSION ⚠️"
-                        elif "private" in error.lower():
-                            error_type = "PRIVATE CHANNEL 🔒"
-                        elif "not found" in error.lower():
-                            error_type = "CHAT NOT FOUND 🔍"
-                        elif "too many" in error.lower() or "rate limit" in error.lower():
-                            error_type = "RATE LIMITED ⏱️"
-                        else:
-                            # Truncate other errors
-                            error_type = error if len(error) < 30 else error[:27] + "..."
-                        
-                        status_text += f"   • Chat ID {target}: {error_type}\n"
+                    parts.append("".join([
+                        f"   • Chat ID {target}: {self._classify_failure(error)}\n"
+                        for target, error in islice(current_failures.items(), max_failures_to_show)
+                    ]))
                     
                     # If we have more failures than we're showing, indicate that
                     if len(current_failures) > max_failures_to_show:
-                        status_text += f"   • ... and {len(current_failures) - max_failures_to_show} more failures\n"
+                        parts.append(f"   • ... and {len(current_failures) - max_failures_to_show} more failures\n")
                     
-                    status_text += "\n"
+                    parts.append("\n")
                 
-                status_text += f"Monitor updating every 5s • Last updated: {current_time}"
+                parts.append(f"Monitor updating every {update_interval}s • Last updated: {now_str}")
+                status_text = "".join(parts)
                 
                 # Update the message
                 try:
                     # Limit the message length to avoid Telegram's restrictions
-                    # Use Telegram's actual limit with a safety margin
-                    max_message_length = 4096  # Telegram's official limit
-                    if len(status_text) > max_message_length:
-                        logger.warning(f"Live monitor message too long ({len(status_text)} chars), truncating")
-                        status_text = status_text[:max_message_length-100] + "\n\n... (message truncated due to length) ...\n"
+                    if len(status_text) > TELEGRAM_MAX_MESSAGE_LENGTH:
+                        logger.warning("Live monitor message too long (%s chars), truncating", len(status_text))
+                        status_text = _safe_truncate(status_text)
                     
-                    # Only update if enough time has passed since last successful update
-                    # This helps avoid flood wait errors
-                    time_since_last_update = time.time() - last_successful_update
-                    if time_since_last_update >= 5:  # Minimum 5 seconds between updates
-                        await self.forwarder.client.edit_message(chat_id, message, status_text)
-                        last_successful_update = time.time()
-                        update_failures = 0  # Reset failure counter after successful update
-                    else:
-                        # Skip this update to avoid flood wait errors
-                        logger.info(f"Skipping monitor update to avoid flood wait (last update was {time_since_last_update:.1f}s ago)")
+                    await self._edit_monitor_message(chat_id, message, status_text)
+                    last_successful_update = time.time()
+                    update_failures = 0  # Reset failure counter after successful update
+                    # Only what was actually shown counts as seen for change detection
+                    prev_signature = signature
                 except Exception as e:
                     error_msg = str(e)
-                    logger.error(f"Error updating monitor message: {error_msg}")
+                    err_l = error_msg.lower()
+                    logger.error("Error updating monitor message: %s", error_msg)
                     update_failures += 1
                     
                     # Handle flood wait errors specifically
-                    if "wait" in error_msg.lower():
+                    if "wait" in err_l:
                         try:
                             # Extract wait time
-                            wait_seconds = int(re.search(r'of (\d+) seconds', error_msg).group(1))
-                            logger.warning(f"Flood wait detected in monitor: {wait_seconds}s. Adjusting update frequency.")
+                            wait_seconds = int(_FLOOD_WAIT_RE.search(error_msg).group(1))
+                            logger.warning("Flood wait detected in monitor: %ss. Adjusting update frequency.", wait_seconds)
                             
                             # Adjust the update interval based on the required wait time
                             # Add extra 5 seconds as safety margin
                             new_wait_time = wait_seconds + 5
                             
                             # Wait the required time plus a safety margin
-                            logger.info(f"Waiting {new_wait_time}s before next monitor update")
-                            await asyncio.sleep(new_wait_time)
+                            logger.info("Waiting %ss before next monitor update", new_wait_time)
+                            if await self._sleep_or_stop(stop, new_wait_time):
+                                break
                             
                             # Update the last update time to avoid immediate retry
                             last_successful_update = time.time()
@@ -767,161 +1171,230 @@ class MonitorDashboard:
                             # Continue to next iteration
                             continue
                         except Exception as wait_error:
-                            logger.error(f"Error processing wait time: {wait_error}")
+                            logger.error("Error processing wait time: %s", wait_error)
                     
                     # If we encounter specific errors, try to recover
-                    if "message to edit not found" in error_msg.lower():
+                    if "message to edit not found" in err_l:
                         logger.warning("Monitor message not found, stopping monitoring")
                         # The message was deleted, stop monitoring
                         self.stop_live_monitor(campaign_id)
-                    elif "message is not modified" in error_msg.lower():
+                    elif "message is not modified" in err_l:
                         # Message wasn't changed, this is fine
                         # Reset last update time to allow future updates
                         last_successful_update = time.time()
                     
                     # If we have too many consecutive failures, increase the wait time
                     if update_failures > 3:
-                        logger.warning(f"Too many monitor update failures ({update_failures}), increasing wait time")
-                        # Exponential backoff
-                        backoff_time = min(30, 5 * (2 ** (update_failures - 3)))
-                        await asyncio.sleep(backoff_time)
+                        logger.warning("Too many monitor update failures (%s), increasing wait time", update_failures)
+                        # Exponential backoff with jitter so monitors don't retry in lockstep
+                        backoff_time = min(30, 5 * (2 ** (update_failures - 3))) * (0.5 + random.random())
+                        await self._sleep_or_stop(stop, backoff_time)
                     else:
                         # Just log other errors but continue
-                        logger.error(f"Unknown error updating monitor: {error_msg}")
-                
-                # Choose update interval based on status
-                update_interval = active_update_interval if status == "sending" else waiting_update_interval
-                
-                # Update the status text with the correct interval
-                status_text = status_text.replace("Monitor updating every 5s", f"Monitor updating every {update_interval}s")
-                
-                # Wait before next update
-                await asyncio.sleep(update_interval)
+                        logger.error("Unknown error updating monitor: %s", error_msg)
                 
-                # Update tracking variables for next iteration
-                previous_status = status
-                previous_sent = total_sent
-                previous_failed = failed_sends
+                # Wait before next update - wake early only once the campaign data changes
+                await self._wait_for_changes(campaign_id, stop, update_interval, idle_refresh_interval)
             
             # Final update if campaign still exists
             if self.campaign_exists(campaign_id):
                 campaign_data = self.get_campaign_data(campaign_id)
                 if campaign_data:
-                    status = campaign_data.get('status', 'Unknown')
+                    now = time.time()
+                    (status, total_sent, failed_sends, rounds_completed, _,
+                     _, targets, msg_id, interval, start_time, _, _) = self._snapshot_campaign(campaign_data, now)
                     display_status = status.upper() if status else "UNKNOWN"
-                    msg_id = campaign_data.get('msg_id', 'unknown')
-                    total_sent = campaign_data.get('total_sent', 0)
-                    failed_sends = campaign_data.get('failed_sends', 0)
-                    targets = campaign_data.get('targets', 0)
-                    rounds_completed = campaign_data.get('rounds_completed', 0)
-                    interval = campaign_data.get('interval', 0)
-                    start_time = campaign_data.get('start_time', time.time())
-                    
-                    # Calculate running time
-                    running_time = int(time.time() - start_time)
-                    running_time_str = format_time_remaining(running_time)
                     
-                    # Calculate success rate with proper logic
-                    success_rate = 0.0
-                    if total_sent > 0:  # Only calculate if there were successful deliveries
-                        success_rate = (total_sent / (total_sent + failed_sends)) * 100
-                        # Cap success rate at 100% for logical display
-                        success_rate = min(success_rate, 100.0)
+                    # Calculate running time and success rate
+                    running_time_str = format_elapsed(start_time, now)
+                    success_rate = self._rate(total_sent, failed_sends)
                     
                     # Format interval
                     minutes, seconds = divmod(interval, 60)
                     interval_str = f"{minutes}m {seconds}s"
                     
-                    # Get current time
-                    current_time = datetime.now().strftime('%H:%M:%S')
-                    
-                    # Final time stamp
-                    final_timestamp = datetime.now().strftime('%H:%M:%S')
-                    
-                    final_text = f"📊 CAMPAIGN MONITOR #{campaign_id} - ENDED\n\n"
-                    final_text += f"🔄 Final Status: {display_status} @ {final_timestamp}\n\n"
-                    final_text += f"📨 Message: {msg_id}\n\n"
-                    final_text += f"⏱️ Interval: {interval_str}\n\n"
-                    final_text += f"🎯 Targets: {targets}\n\n"
+                    # Final time stamp, used for both the status line and the footer
+                    final_timestamp = time.strftime('%H:%M:%S', time.localtime(now))
                     
-                    # Enhanced statistics with completion indicators
-                    final_text += f"📈 Final Statistics:\n"
-                    final_text += f"   ✅ Total Sent: {total_sent}\n"
+                    final_parts = [
+                        f"📊 CAMPAIGN MONITOR #{campaign_id} - ENDED\n\n",
+                        f"🔄 Final Status: {display_status} @ {final_timestamp}\n\n",
+                        f"📨 Message: {msg_id}\n\n",
+                        f"⏱️ Interval: {interval_str}\n\n",
+                        f"🎯 Targets: {targets}\n\n",
+                        # Enhanced statistics with completion indicators
+                        _HDR_FINAL_STATS,
+                        f"   ✅ Total Sent: {total_sent}\n",
+                    ]
                     
                     # Show percentage of targets reached
                     if targets > 0:
                         percentage_reached = (total_sent / targets) * 100
-                        final_text += f"   📊 Target Reach: {percentage_reached:.1f}% of targets\n"
+                        final_parts.append(f"   📊 Target Reach: {percentage_reached:.1f}% of targets\n")
                     
-                    final_text += f"   ❌ Failures: {failed_sends}\n"
-                    final_text += f"   📊 Success Rate: {success_rate:.1f}%\n\n"
+                    final_parts.append(f"   ❌ Failures: {failed_sends}\n")
+                    final_parts.append(f"   📊 Success Rate: {success_rate:.1f}%\n\n")
                     
-                    final_text += f"🔄 Final Progress:\n"
-                    final_text += f"   • Rounds completed: {rounds_completed}\n"
+                    final_parts.append(_HDR_FINAL_PROGRESS)
+                    final_parts.append(f"   • Rounds completed: {rounds_completed}\n")
                     
                     # Add average sends per round if rounds completed
                     if rounds_completed > 0:
                         avg_sends = total_sent / rounds_completed
-                        final_text += f"   • Avg. sends per round: {avg_sends:.1f}\n\n"
+                        final_parts.append(f"   • Avg. sends per round: {avg_sends:.1f}\n\n")
                     else:
-                        final_text += "\n"
+                        final_parts.append("\n")
                         
-                    final_text += f"⏰ Total Runtime: {running_time_str}\n\n"
-                    final_text += f"⏹️ Monitoring ended at: {current_time}"
+                    final_parts.append(f"⏰ Total Runtime: {running_time_str}\n\n")
+                    final_parts.append(f"⏹️ Monitoring ended at: {final_timestamp}")
+                    final_text = "".join(final_parts)
                     
                     try:
                         # Make sure final message respects Telegram's size limits
-                        # Use a more conservative limit to ensure we stay well under Telegram's maximum
-                        max_message_length = 4096  # Telegram's official limit
-                        if len(final_text) > max_message_length:
-                            logger.warning(f"Final monitor message too long ({len(final_text)} chars), truncating")
-                            final_text = final_text[:max_message_length-100] + "\n\n... (message truncated due to length) ...\n"
-                            
-                        await self.forwarder.client.edit_message(chat_id, message, final_text)
+                        if len(final_text) > TELEGRAM_MAX_MESSAGE_LENGTH:
+                            logger.warning("Final monitor message too long (%s chars), truncating", len(final_text))
+                            final_text = _safe_truncate(final_text)
+                        
+                        await self._edit_monitor_message(chat_id, message, final_text)
                     except Exception as e:
                         error_msg = str(e)
-                        logger.error(f"Error updating final monitor message: {error_msg}")
+                        err_l = error_msg.lower()
+                        logger.error("Error updating final monitor message: %s", error_msg)
                         
                         # If error is not a critical one, just log it
-                        if "message to edit not found" in error_msg.lower():
+                        if "message to edit not found" in err_l:
                             logger.warning("Final monitor message not found, it may have been deleted")
-                        elif "message is not modified" in error_msg.lower():
+                        elif "message is not modified" in err_l:
                             # Message wasn't changed, this is fine
                             logger.debug("Final message not modified, content likely unchanged")
-                        elif "wait" in error_msg.lower() or "flood" in error_msg.lower():
-                            # FloodWait error from Telegram - extract the wait time
-                            wait_time = 60  # Default wait time
-                            try:
+                        elif "wait" in err_l or "flood" in err_l:
+                            # FloodWait error from Telegram - wait as told and retry a bounded number of times
+                            for attempt in range(1, self.FINAL_EDIT_MAX_RETRIES + 1):
+                                wait_time = 60  # Default wait time
                                 # Try to extract wait time from error message
-                                match = re.search(r'A wait of (\d+) seconds', error_msg)
+                                match = _FLOOD_WAIT_RE.search(error_msg)
                                 if match:
                                     wait_time = int(match.group(1))
-                                    logger.warning(f"FloodWait detected: Waiting for {wait_time} seconds")
+                                    logger.warning("FloodWait detected: Waiting for %s seconds", wait_time)
                                 # Add a small buffer to the wait time just to be safe
                                 wait_time += 5
-                                # Wait the required time
                                 await asyncio.sleep(wait_time)
-                                # Try again after waiting
-                                logger.info(f"Retrying after FloodWait ({wait_time}s)")
-                                await self.forwarder.client.edit_message(chat_id, message, final_text)
-                            except Exception as retry_error:
-                                logger.error(f"Error retrying after FloodWait: {str(retry_error)}")
+                                
+                                # Ask Telegram what the message shows now - nothing to retry if the
+                                # summary is already there or the message was deleted meanwhile
+                                try:
+                                    current = await self.forwarder.client.get_messages(chat_id, ids=message.id)
+                                    if current is None or current.raw_text == final_text:
+                                        break
+                                except Exception as check_error:
+                                    logger.debug("Couldn't read back final monitor message: %s", check_error)
+                                
+                                logger.info("Retrying after FloodWait (%ss, attempt %s/%s)", wait_time, attempt, self.FINAL_EDIT_MAX_RETRIES)
+                                try:
+                                    await self._edit_monitor_message(chat_id, message, final_text)
+                                    break
+                                except Exception as retry_error:
+                                    logger.error("Error retrying after FloodWait: %s", retry_error)
+                                    error_msg = str(retry_error)
+                                    retry_l = error_msg.lower()
+                                    # Only another flood wait is worth waiting out again
+                                    if "wait" not in retry_l and "flood" not in retry_l:
+                                        break
                         else:
                             # Just log other errors
-                            logger.error(f"Unknown error updating final message: {error_msg}")
+                            logger.error("Unknown error updating final message: %s", error_msg)
             
-            logger.info(f"Stopped live monitoring for campaign {campaign_id}")
+            logger.info("Stopped live monitoring for campaign %s", campaign_id)
         except asyncio.CancelledError:
-            logger.info(f"Live monitor task for campaign {campaign_id} was cancelled")
+            logger.info("Live monitor task for campaign %s was cancelled", campaign_id)
         except Exception as e:
-            logger.error(f"Error in live monitor for campaign {campaign_id}: {str(e)}")
+            logger.error("Error in live monitor for campaign %s: %s", campaign_id, e)
+        finally:
+            # Drop the change event unless a new monitor was started for the same campaign
+            if campaign_id not in self.active_monitors:
+                self._dirty.pop(campaign_id, None)
 
     def stop_live_monitor(self, campaign_id):
-        if campaign_id in self.active_monitors:
-            del self.active_monitors[campaign_id]
+        handle = self.active_monitors.pop(campaign_id, None)
+        if handle is not None:
+            # Wake the monitor so it stops now instead of waiting out its timeout
+            handle.stop.set()
+        self._mark_dirty(campaign_id)
 
     def stop_all_monitoring(self):
+        for handle in self.active_monitors.values():
+            handle.stop.set()
         self.active_monitors.clear()
+        for dirty in self._dirty.values():
+            dirty.set()
+
+    @classmethod
+    def _classify_failure(cls, error):
+        """Short label for a failure reason, falling back to the (truncated) error itself"""
+        el = error.lower()
+        return next(
+            (label for keyword, label in cls._ERROR_LABELS if keyword in el),
+            error if len(error) < 30 else error[:27] + "..."
+        )
+
+    @staticmethod
+    def _rate(sent, failed):
+        """Success percentage of attempted sends (0.0 when nothing was attempted)"""
+        attempted = sent + failed
+        return 100.0 * sent / attempted if attempted else 0.0
+
+    def _snapshot_campaign(self, campaign_data, now):
+        """Read the monitored fields of a campaign in one pass, in _CAMPAIGN_FIELDS order"""
+        values = [campaign_data.get(field, default) for field, default in self._CAMPAIGN_FIELDS]
+        # start_time and next_round_time fall back to the current time
+        if values[9] is None:
+            values[9] = now
+        if values[10] is None:
+            values[10] = now
+        values[11] = self._format_progress(campaign_data, values[11])
+        return values
+
+    @staticmethod
+    def _format_progress(data, default=''):
+        """Progress line for a campaign - rounds store raw counters, formatted only when shown"""
+        processed = data.get('targets_processed')
+        if processed is None:
+            return data.get('progress', default)
+        return f"Processed {processed}/{data.get('targets_total', 0)} targets"
+
+    async def _edit_monitor_message(self, chat_id, message, text):
+        """Edit a monitor message through the shared per-session edit rate limit"""
+        async with self._edit_semaphore:
+            wait = self.MONITOR_EDIT_MIN_GAP - (time.monotonic() - self._last_edit_time)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                await self.forwarder.client.edit_message(chat_id, message, text)
+            finally:
+                self._last_edit_time = time.monotonic()
+
+    @staticmethod
+    async def _sleep_or_stop(stop, seconds):
+        """Sleep for up to `seconds`; returns True if the monitor was stopped meanwhile"""
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=seconds)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _wait_for_changes(self, campaign_id, stop, min_wait, max_wait):
+        """Sleep at least min_wait seconds, then until the campaign changes or max_wait has passed"""
+        if await self._sleep_or_stop(stop, min_wait):
+            return
+        dirty = self._dirty.get(campaign_id)
+        if dirty is None:
+            return
+        if not dirty.is_set():
+            try:
+                await asyncio.wait_for(dirty.wait(), timeout=max(0, max_wait - min_wait))
+            except asyncio.TimeoutError:
+                pass
+        dirty.clear()
 
     def get_active_monitor_count(self):
         return len(self.active_monitors)
@@ -933,8 +1406,10 @@ class MonitorDashboard:
         return "📊 Performance chart not yet implemented"
     def generate_dashboard(self, targeted_only=False):
         """Generate a detailed monitoring dashboard with real-time campaign stats and status indicators"""
-        current_time = datetime.now().strftime('%H:%M:%S')
-        dashboard = f"📊 **REAL-TIME CAMPAIGN DASHBOARD** (Updated: {current_time})\n\n"
+        # Read the clock once for the header and every countdown
+        now = time.time()
+        current_time = time.strftime('%H:%M:%S', time.localtime(now))
+        dashboard = [f"📊 **REAL-TIME CAMPAIGN DASHBOARD** (Updated: {current_time})\n\n"]
         
         # Count active versus inactive campaigns
         active_count = 0
@@ -942,11 +1417,12 @@ class MonitorDashboard:
         total_messages_sent = 0
         total_failures = 0
         
-        # Process each campaign
+        # Process each campaign in a single pass over a snapshot, so campaigns added
+        # while the dashboard is built can't change the dict mid-iteration
         active_campaigns = []
         inactive_campaigns = []
         
-        for campaign_id, data in self.campaigns.items():
+        for campaign_id, data in list(self.campaigns.items()):
             if targeted_only and "targeted_" not in campaign_id:
                 continue
                 
@@ -955,11 +1431,17 @@ class MonitorDashboard:
             targets = data.get('targets', 0)
             sent = data.get('total_sent', 0)
             failed = data.get('failed_sends', 0)
-            progress = data.get('progress', '')
+            progress = self._format_progress(data)
             last_update = data.get('last_update_time', '')
             next_round = data.get('next_round_time', 0)
-            time_remaining = data.get('estimated_time_remaining', '')
-            success_rate = data.get('success_rate', 'N/A')
+            # Round counters and the ETA are stored raw and only formatted here
+            round_sent = data.get('success_count', 0)
+            round_failed = data.get('failure_count', 0)
+            success_rate = f"{self._rate(round_sent, round_failed):.1f}%" if round_sent + round_failed else "N/A"
+            time_remaining = ''
+            if 'estimated_time_remaining' in data:
+                eta = data['estimated_time_remaining']
+                time_remaining = format_time_remaining(int(eta)) if eta is not None else "Calculating..."
             rounds_completed = data.get('rounds_completed', 0)
             scheduled_for = data.get('scheduled_for', None)
             
@@ -972,21 +1454,21 @@ class MonitorDashboard:
                 active_count += 1
                 status_emoji = "🔄" if status == 'sending' else "⚠️"
                 
-                campaign_info = (
+                campaign_info = [
                     f"{status_emoji} **Campaign:** `{campaign_id}`\n"
                     f"   • **Status:** {status.upper()}\n"
                     f"   • **Progress:** {progress}\n"
                     f"   • **Sent:** {sent}/{targets} targets ({success_rate} success rate)\n"
                     f"   • **Failed:** {failed} targets\n"
-                )
+                ]
                 
                 # Add time details if available
                 if time_remaining:
-                    campaign_info += f"   • **Est. Remaining:** {time_remaining}\n"
+                    campaign_info.append(f"   • **Est. Remaining:** {time_remaining}\n")
                 if last_update:
-                    campaign_info += f"   • **Last Update:** {last_update}\n"
+                    campaign_info.append(f"   • **Last Update:** {last_update}\n")
                 
-                active_campaigns.append(campaign_info)
+                active_campaigns.append("".join(campaign_info))
                 
             elif status == 'waiting':
                 active_count += 1
@@ -994,23 +1476,22 @@ class MonitorDashboard:
                 # Calculate time until next round
                 time_until_next = ""
                 if next_round > 0:
-                    now = time.time()
                     if next_round > now:
                         seconds_remaining = int(next_round - now)
                         time_until_next = format_time_remaining(seconds_remaining)
                 
-                campaign_info = (
+                campaign_info = [
                     f"⏳ **Campaign:** `{campaign_id}`\n"
                     f"   • **Status:** WAITING FOR NEXT ROUND\n"
                     f"   • **Completed:** {rounds_completed} rounds\n"
                     f"   • **Sent:** {sent}/{targets} targets\n"
                     f"   • **Failed:** {failed} targets\n"
-                )
+                ]
                 
                 if time_until_next:
-                    campaign_info += f"   • **Next Round In:** {time_until_next}\n"
+                    campaign_info.append(f"   • **Next Round In:** {time_until_next}\n")
                 
-                active_campaigns.append(campaign_info)
+                active_campaigns.append("".join(campaign_info))
                 
             elif status == 'scheduled':
                 active_count += 1
@@ -1031,23 +1512,23 @@ class MonitorDashboard:
         
         # Build the dashboard with sections
         if active_count > 0:
-            dashboard += f"🔴 **ACTIVE CAMPAIGNS ({active_count}):**\n\n"
-            dashboard += "\n".join(active_campaigns)
-            dashboard += "\n\n"
+            dashboard.append(f"🔴 **ACTIVE CAMPAIGNS ({active_count}):**\n\n")
+            dashboard.append("\n".join(active_campaigns))
+            dashboard.append("\n\n")
         
         if inactive_count > 0:
-            dashboard += f"⚪ **INACTIVE CAMPAIGNS ({inactive_count}):**\n\n"
-            dashboard += "".join(inactive_campaigns)
-            dashboard += "\n\n"
+            dashboard.append(f"⚪ **INACTIVE CAMPAIGNS ({inactive_count}):**\n\n")
+            dashboard.append("".join(inactive_campaigns))
+            dashboard.append("\n\n")
         
         # Add summary stats
-        dashboard += f"📈 **TOTAL STATISTICS:**\n"
-        dashboard += f"   • Total Campaigns: {active_count + inactive_count}\n"
-        dashboard += f"   • Total Messages Sent: {total_messages_sent}\n"
-        dashboard += f"   • Total Failures: {total_failures}\n"
-        dashboard += f"   • Overall Success Rate: {(total_messages_sent / (total_messages_sent + total_failures) * 100):.1f}%" if (total_messages_sent + total_failures) > 0 else "N/A"
+        dashboard.append(_HDR_TOTAL_STATS)
+        dashboard.append(f"   • Total Campaigns: {active_count + inactive_count}\n")
+        dashboard.append(f"   • Total Messages Sent: {total_messages_sent}\n")
+        dashboard.append(f"   • Total Failures: {total_failures}\n")
+        dashboard.append(f"   • Overall Success Rate: {self._rate(total_messages_sent, total_failures):.1f}%" if (total_messages_sent + total_failures) > 0 else "N/A")
         
-        return dashboard if active_count + inactive_count > 0 else "📝 No campaigns found. Start a campaign with /startad or /schedule."
+        return "".join(dashboard) if active_count + inactive_count > 0 else "📝 No campaigns found. Start a campaign with /startad or /schedule."
 
 
 class MessageForwarder:
@@ -1055,8 +1536,21 @@ class MessageForwarder:
     instance = None
     # Primary admin ID is fixed and protected from removal
     primary_admin = 1715541908  # This ID is protected and cannot be removed
-
-    def __init__(self, client):
+    # Default bound for the outgoing message queue
+    DEFAULT_QUEUE_SIZE = 1000
+    # Most recent errors kept per failed chat
+    ERROR_HISTORY_LIMIT = 100
+    # Record a per-failure error_history entry; turn off for huge campaigns to keep only counts + last error
+    detailed_history = True
+    # How many forwards of a batch may be in flight at once (smart mode always uses 1)
+    FORWARD_CONCURRENCY = 5
+    # How many /targetedad targets are resolved (joined, probed) at once
+    RESOLVE_CONCURRENCY = 4
+    # Exponential backoff between forward retries: base delay and upper bound, in seconds
+    RETRY_BASE_DELAY = 1.0
+    RETRY_MAX_DELAY = 30.0
+
+    def __init__(self, client, max_queue_size: int = DEFAULT_QUEUE_SIZE):
         self.client = client
         self.client.flood_sleep_threshold = 5  # Reduce flood wait time
         self.flood_protection = {
@@ -1067,19 +1561,23 @@ class MessageForwarder:
         }
         self.forwarding_enabled = False
         self.target_chats: Set[Union[int, Tuple[int, int]]] = set()
+        self._targets_version = 0  # Bumped on every target_chats change so campaigns know to re-read it
+        self._target_meta: Dict[Any, Tuple[str, str]] = {}  # target -> (log info, entity type)
         self.forward_interval = 300  # Default from config
         self.stored_messages: Dict[str, Any] = {}  # Store multiple messages by ID
         self._commands_registered = False
         self._forwarding_tasks: Dict[str, asyncio.Task] = {}  # Track multiple forwarding tasks
-        self._message_queue = asyncio.Queue()  # Message queue for faster processing
+        self._msgid_to_campaign: Dict[str, str] = {}  # Ad ID -> campaign ID of its /startad campaign
+        self._message_queue = asyncio.Queue(maxsize=max_queue_size)  # Bounded message queue so bursts cannot grow memory without limit
         self._cache = {}
+        self._offline_notices: Dict[int, float] = {}  # chat_id -> monotonic time of last "bot is offline" reply
         
         # Track failed chats with detailed information about failures
         # Structure: {chat_id: {
         #    'name': str, 'type': str, 'first_failure': datetime,
         #    'last_attempt': datetime, 'reason': str, 'detail': str,
         #    'failed_count': int, 'campaign_ids': set,
-        #    'error_history': [{timestamp, campaign_id, error_type, details}]
+        #    'error_history': deque([{timestamp, campaign_id, error_type, details}], maxlen=ERROR_HISTORY_LIMIT)
         # }}
         self.failed_chats = {}  # Cache for frequently accessed data
 
@@ -1088,18 +1586,18 @@ class MessageForwarder:
         self.targeted_campaigns: Dict[str, Dict] = {}  # Store targeted ad campaigns
 
         # Admin management - Always ensure primary admin is included
-        admin_ids = os.getenv('ADMIN_USER_IDS', '').split(',')
-        self.admins: Set[int] = set([int(id.strip()) for id in admin_ids if id.strip()])
-        # Always ensure the primary admin is in the admins list
-        self.admins.add(MessageForwarder.primary_admin)
+        # Stored as a frozenset; /addadmin and /removeadmin rebind it rather than mutate it
+        self.admins: FrozenSet[int] = ADMIN_USER_IDS | {MessageForwarder.primary_admin}
 
         # Analytics
         self.analytics = {
-            "forwards": {},  # Track successful forwards
-            "failures": {},  # Track failed forwards
-            "start_time": time.time(),  # Track when bot started
+            "forwards": defaultdict(lambda: defaultdict(int)),  # Successful forwards: day -> campaign key -> count
+            "failures": defaultdict(lambda: defaultdict(list)),  # Failed forwards: day -> campaign key -> errors
+            "start_time": time.monotonic(),  # Track when bot started (monotonic - only used for uptime)
             "auto_replies": {}  # Store auto-reply patterns
         }
+        # Bumped for every campaign ID so two campaigns started in the same tick never share one
+        self._campaign_seq = 0
         
         # Initialize default auto-replies
         self.auto_replies = {
@@ -1119,6 +1617,7 @@ class MessageForwarder:
         self.active_conversations = {}  # Track active conversations by chat_id
         self.entity_knowledge = {}  # Store knowledge about entities we interact with
         self.smart_mode = True  # Toggle for smart behavior with human-like delays
+        self.animations_enabled = False  # Decorative command animations - every frame is a Telegram edit
 
         # Set this instance as the current one
         MessageForwarder.instance = self
@@ -1139,20 +1638,17 @@ class MessageForwarder:
             logger.error(f"Error getting sender name: {str(e)}")
             return "User"  # Fallback in case of error
 
-    async def forward_stored_message(self, msg_id: str = "default", targets: Optional[Set[int]] = None, interval: Optional[int] = None, campaign_id: Optional[str] = None, max_queue_size: int = 100):
-        # Initialize message queue if not exists
-        if not hasattr(self, '_message_queue'):
-            self._message_queue = asyncio.Queue(maxsize=max_queue_size)
+    async def forward_stored_message(self, msg_id: str = "default", targets: Optional[Set[int]] = None, interval: Optional[int] = None, campaign_id: Optional[str] = None):
         """Periodically forward stored message to target chats with error handling and continuous operation"""
         # Define campaign_marker at the top level to ensure it's always bound
         campaign_marker = None
         try:
             # Use provided campaign_id if available, otherwise generate a new one
             # This allows us to link the task with a pre-existing campaign ID
-            campaign_marker = campaign_id if campaign_id else f"adcampaign_{msg_id}_{int(time.time())}"
+            campaign_marker = campaign_id if campaign_id else f"adcampaign_{msg_id}_{self._campaign_suffix()}"
             
             if msg_id not in self.stored_messages:
-                logger.error(f"Message ID {msg_id} not found in stored messages")
+                logger.error("Message ID %s not found in stored messages", msg_id)
                 # Add to monitor with error status
                 self.monitor.add_campaign(campaign_marker, {
                     "msg_id": msg_id,
@@ -1167,10 +1663,11 @@ class MessageForwarder:
             use_interval = interval if interval is not None else self.forward_interval
             
             # Log the campaign ID we're using to track this forwarding task
-            logger.info(f"Using campaign marker: {campaign_marker} for message {msg_id}")
+            logger.info("Using campaign marker: %s for message %s", campaign_marker, msg_id)
             
-            # Store target list for failure checking
+            # Store target list for failure checking - only rebuilt when target_chats changes
             target_list = list(use_targets)
+            targets_version = self._targets_version
             
             # Add this to monitor for tracking with explicit error tracking
             self.monitor.add_campaign(campaign_marker, {
@@ -1187,13 +1684,48 @@ class MessageForwarder:
             })
 
             # Send monitor dashboard as a reply
-            logger.info(f"Starting periodic forwarding task for message {msg_id}")
+            logger.info("Starting periodic forwarding task for message %s", msg_id)
 
             round_number = 0
+            
+            # Our own user id (from_peer for ForwardMessagesRequest) never changes during
+            # the session, so resolve it once and share it through the instance cache
+            bot_user_id = (await self._get_me()).id
+
+            # Forwards inside a batch overlap on the connection; smart mode keeps them one at
+            # a time so its human-like delays still space the messages out
+            forward_semaphore = asyncio.Semaphore(1 if self.smart_mode else self.FORWARD_CONCURRENCY)
+            
+            async def _forward_one(target):
+                """Forward the message to one target with retries; returns (target, error message, error category)"""
+                async with forward_semaphore:
+                    try:
+                        # Get target info for better error reporting (classified once per target)
+                        target_info = self._target_info(target)[0]
+
+                        failure = await self._forward_with_retry(target, message.id, bot_user_id)
+                        if failure is not None:
+                            return (target, *failure)
+
+                        # Update analytics
+                        today = datetime.now().strftime('%Y-%m-%d')
+                        self.analytics["forwards"][today][(msg_id, target)] += 1
+
+                        logger.info("Successfully forwarded message %s to %s", msg_id, target_info)
+                        
+                        # Apply human-like delay if smart mode is enabled
+                        if self.smart_mode:
+                            # Log the action for behavior tracking
+                            self.human_behavior.log_action("message", target, {"type": "forward", "msg_id": msg_id})
+                            # Apply natural delay between messages
+                            await self.human_behavior.natural_delay("message")
+                        return target, None, None
+                    except Exception as e:
+                        return target, str(e), self._classify_error(str(e))
 
             while True:
                 if msg_id not in self.stored_messages:  # Check if message was deleted
-                    logger.info(f"Message {msg_id} no longer exists, stopping forwarding")
+                    logger.info("Message %s no longer exists, stopping forwarding", msg_id)
                     # Update monitor
                     self.monitor.update_campaign_status(campaign_marker, "stopped")
                     break
@@ -1203,7 +1735,7 @@ class MessageForwarder:
                 failure_count = 0
                 current_failures = {}
 
-                logger.info(f"Forwarding message {msg_id} to {len(use_targets)} targets (Round {round_number})")
+                logger.info("Forwarding message %s to %s targets (Round %s)", msg_id, len(use_targets), round_number)
 
                 # Update monitor before sending
                 self.monitor.update_campaign(campaign_marker, {
@@ -1214,253 +1746,131 @@ class MessageForwarder:
                 # Get current campaign data before processing targets
                 campaign_data = self.monitor.get_campaign_data(campaign_marker) or {}
                 
+                # Pick up targets added/removed since the last round
+                if use_targets is self.target_chats and targets_version != self._targets_version:
+                    target_list = list(use_targets)
+                    targets_version = self._targets_version
+                
                 # Split targets into smaller batches of 20
-                target_list = list(use_targets)
                 batch_size = 20
-                last_batch_index = 0
                 
                 for i in range(0, len(target_list), batch_size):
                     # Record batch start time for timing calculations
                     batch_start_time = datetime.now()
-                    last_batch_index = i
                     batch = target_list[i:i + batch_size]
                     
-                    # Process each target in batch
-                    for target in batch:
+                    # Forward to the whole batch concurrently, then account for the results in order
+                    results = await asyncio.gather(*(_forward_one(target) for target in batch))
+                    
+                    # Tallied locally and handed to the monitor in one update at the end of the batch
+                    batch_sent = 0
+                    batch_failed = 0
+                    last_target = None
+                    last_failed_target = None
+                    last_error = None
+                    
+                    for target, error_message, error_type in results:
+                        if error_message is None:
+                            success_count += 1
+                            batch_sent += 1
+                            last_target = target
+                            continue
+                        
+                        failure_count += 1
+                        batch_failed += 1
+                        last_failed_target = target
+                        last_error = error_message
+                        # Record the error in current_failures; the target itself is the key, so
+                        # a forum topic (chat_id, topic_id) never overwrites its parent chat
+                        current_failures[target] = error_message
+                        logger.error("Error forwarding to %s: %s", target, error_message)
+                            
+                        # Track in failed chats system with detailed information
                         try:
-                            # Get target info for better error reporting
-                            target_info = ""
-                            entity = None
-                            try:
-                                # Get target info without using get_entity
-                                if isinstance(target, int) or (isinstance(target, str) and target.lstrip('-').isdigit()):
-                                    # For numeric IDs, just use the ID as info
-                                    target_info = f"ID: {target}"
-                                elif isinstance(target, str):
-                                    if target.startswith('@'):
-                                        target_info = target  # Already a username format
-                                    elif 't.me/' in target:
-                                        target_info = f"Link: {target}"
-                                    else:
-                                        target_info = f"Chat: {target}"
-                                elif hasattr(entity, 'phone'):
-                                    target_info = f"+{entity.phone}"
-                            except:
-                                target_info = str(target)
-
-                            # Try forwarding with retries
-                            max_retries = 3
-                            for retry in range(max_retries):
-                                try:
-                                    # Get the user ID (from_peer) of the bot - this is needed for ForwardMessagesRequest
-                                    me = await self.client.get_me()
-                                    bot_user_id = me.id
-                                    
-                                    # Check if target is a tuple (chat_id, topic_id)
-                                    if isinstance(target, tuple) and len(target) == 2:
-                                        chat_id, topic_id = target
-                                        logger.info(f"Forwarding to topic: chat_id={chat_id}, topic_id={topic_id}")
-                                        
-                                        # Use ForwardMessagesRequest for topics
-                                        forwarded = await self.client(ForwardMessagesRequest(
-                                            from_peer=bot_user_id,
-                                            id=[message.id],
-                                            to_peer=chat_id,
-                                            top_msg_id=topic_id  # Use topic_id as top_msg_id for forum topics
-                                        ))
-                                        
-                                        # We no longer need to send the confirmation message
-                                        # The message is already properly forwarded to the topic
-                                    else:
-                                        # Regular chat - use ForwardMessagesRequest with numeric IDs
-                                        await self.client(ForwardMessagesRequest(
-                                            from_peer=bot_user_id,
-                                            id=[message.id],
-                                            to_peer=target
-                                        ))
-                                    success_count += 1
-                                    
-                                    # Update the monitor immediately after each successful send for real-time stats
-                                    try:
-                                        # Get current campaign data
-                                        current_data = self.monitor.get_campaign_data(campaign_marker) or {}
-                                        current_sent = current_data.get("total_sent", 0)
-                                        
-                                        # Update monitor with real-time status
-                                        self.monitor.update_campaign(campaign_marker, {
-                                            "total_sent": current_sent + 1,
-                                            "last_target": str(target),
-                                            "last_update_time": datetime.now().strftime('%H:%M:%S'),
-                                            "status": "sending",
-                                            "progress": f"Sent to {success_count}/{len(batch)} in current batch"
-                                        })
-                                    except Exception as update_error:
-                                        logger.error(f"Error updating monitor in real-time: {update_error}")
-                                    
-                                    logger.info(f"Successfully forwarded message to {target}")
-                                    break
-                                except Exception as e:
-                                    error_msg = str(e)
-                                    logger.error(f"Error forwarding to {target}: {error_msg}")
-                                    
-                                    # Add specific error logging for common issues
-                                    if "banned" in error_msg.lower():
-                                        logger.error(f"Target {target} has banned the bot or the bot is banned from the channel")
-                                    elif "not found" in error_msg.lower():
-                                        logger.error(f"Target {target} was not found (may not exist)")
-                                    elif "private" in error_msg.lower():
-                                        logger.error(f"Target {target} is a private channel the bot cannot access")
-                                    elif "permission" in error_msg.lower() or "403" in error_msg:
-                                        logger.error(f"Bot lacks permission to forward to {target}")
-                                    elif "Too many" in error_msg or "420" in error_msg:
-                                        logger.error(f"Rate limit hit when forwarding to {target}, waiting longer")
-                                        await asyncio.sleep(5)  # Wait longer for rate limits
-                                        
-                                    if retry == max_retries - 1:
-                                        raise
-                                    await asyncio.sleep(2)  # Wait before retry
-
-                            # Update analytics
-                            today = datetime.now().strftime('%Y-%m-%d')
-                            if today not in self.analytics["forwards"]:
-                                self.analytics["forwards"][today] = {}
-
-                            campaign_key = f"{msg_id}_{target}"
-                            if campaign_key not in self.analytics["forwards"][today]:
-                                self.analytics["forwards"][today][campaign_key] = 0
-
-                            self.analytics["forwards"][today][campaign_key] += 1
-
-                            logger.info(f"Successfully forwarded message {msg_id} to {target_info}")
+                            # Keyed by the target as stored - /retryfailed unpacks (chat_id, topic_id) keys itself
+                            target_key = target
+                                
+                            # error_type was classified once when the forward failed
+                            now = datetime.now()  # One timestamp for every field of this failure
                             
-                            # Apply human-like delay if smart mode is enabled
-                            if self.smart_mode:
-                                # Log the action for behavior tracking
-                                self.human_behavior.log_action("message", target, {"type": "forward", "msg_id": msg_id})
-                                # Apply natural delay between messages
-                                await self.human_behavior.natural_delay("message")
-                        except Exception as e:
-                            failure_count += 1
-                            error_message = str(e)
-                            # Record the error in current_failures
-                            current_failures[str(target)] = error_message
-                            logger.error(f"Error forwarding to {target}: {error_message}")
+                            history_entry = None
+                            if self.detailed_history:
+                                history_entry = {
+                                    'timestamp': now.isoformat(),
+                                    'campaign_id': campaign_marker,
+                                    'error_type': error_type,
+                                    'details': error_message
+                                }
                             
-                            # Track in failed chats system with detailed information
-                            try:
-                                # Convert tuple target (chat_id, topic_id) to string for consistency
-                                target_key = target[0] if isinstance(target, tuple) else target
+                            # Get or create the failed chat entry
+                            if target_key not in self.failed_chats:
+                                # Entity type comes from the cached target classification, no API calls
+                                entity_type = self._target_info(target)[1]
+                                entity_name = str(target)
                                 
-                                # Get or create the failed chat entry
-                                if target_key not in self.failed_chats:
-                                    # Try to get entity info without triggering errors
-                                    entity_type = "unknown"
-                                    entity_name = str(target)
-                                    try:
-                                        # Use direct string checks instead of API calls
-                                        if isinstance(target, int) or (isinstance(target, str) and target.lstrip('-').isdigit()):
-                                            if str(target).startswith('-100'):
-                                                entity_type = "channel"
-                                            elif str(target).startswith('-'):
-                                                entity_type = "group"
-                                            else:
-                                                entity_type = "user"
-                                    except:
-                                        pass
-                                        
-                                    # Create new failed chat entry
-                                    self.failed_chats[target_key] = {
-                                        'name': entity_name,
-                                        'type': entity_type,
-                                        'first_failure': datetime.now(),
-                                        'last_attempt': datetime.now(),
-                                        'reason': self._classify_error(error_message),
-                                        'detail': error_message,
-                                        'failed_count': 1,
-                                        'campaign_ids': {campaign_marker},
-                                        'error_history': [{
-                                            'timestamp': datetime.now().isoformat(),
-                                            'campaign_id': campaign_marker,
-                                            'error_type': self._classify_error(error_message),
-                                            'details': error_message
-                                        }]
-                                    }
-                                else:
-                                    # Update existing failed chat entry
-                                    failed_chat = self.failed_chats[target_key]
-                                    failed_chat['last_attempt'] = datetime.now()
-                                    failed_chat['reason'] = self._classify_error(error_message)
-                                    failed_chat['detail'] = error_message
-                                    failed_chat['failed_count'] += 1
-                                    if 'campaign_ids' not in failed_chat:
-                                        failed_chat['campaign_ids'] = set()
-                                    failed_chat['campaign_ids'].add(campaign_marker)
-                                    
-                                    # Add to error history
-                                    if 'error_history' not in failed_chat:
-                                        failed_chat['error_history'] = []
-                                    failed_chat['error_history'].append({
-                                        'timestamp': datetime.now().isoformat(),
-                                        'campaign_id': campaign_marker,
-                                        'error_type': self._classify_error(error_message),
-                                        'details': error_message
-                                    })
-                            except Exception as failed_chat_error:
-                                logger.error(f"Error updating failed chats system: {failed_chat_error}")
-                            
-                            # Update monitor immediately with failure information for real-time tracking
-                            try:
-                                # Get current campaign data
-                                current_data = self.monitor.get_campaign_data(campaign_marker) or {}
-                                current_failed = current_data.get("failed_sends", 0)
+                                # Create new failed chat entry
+                                self.failed_chats[target_key] = {
+                                    'name': entity_name,
+                                    'type': entity_type,
+                                    'first_failure': now,
+                                    'last_attempt': now,
+                                    'reason': error_type,
+                                    'detail': error_message,
+                                    'failed_count': 1,
+                                    'campaign_ids': {campaign_marker},
+                                    'error_history': deque([history_entry] if history_entry else (), maxlen=self.ERROR_HISTORY_LIMIT)
+                                }
+                            else:
+                                # Update existing failed chat entry
+                                failed_chat = self.failed_chats[target_key]
+                                failed_chat['last_attempt'] = now
+                                failed_chat['reason'] = error_type
+                                failed_chat['detail'] = error_message
+                                failed_chat['failed_count'] += 1
+                                failed_chat['campaign_ids'].add(campaign_marker)
                                 
-                                # Update monitor with real-time status including failure
-                                self.monitor.update_campaign(campaign_marker, {
-                                    "failed_sends": current_failed + 1,
-                                    "last_failed_target": str(target),
-                                    "last_error": error_message[:100] if len(error_message) > 100 else error_message,
-                                    "last_update_time": datetime.now().strftime('%H:%M:%S'),
-                                    "current_failures": current_failures,
-                                    "status": "sending_with_errors"
-                                })
-                            except Exception as update_error:
-                                logger.error(f"Error updating monitor for failure in real-time: {update_error}")
-                        
-                    # More frequent batch updates after every 5 targets or at end of batch
-                    if (len(batch) % 5 == 0) or (len(batch) < 5):
-                        # Fetch the latest campaign data for updating
-                        latest_campaign_data = self.monitor.get_campaign_data(campaign_marker) or {}
-                        current_sent = latest_campaign_data.get("total_sent", 0)
-                        current_failed = latest_campaign_data.get("failed_sends", 0)
-                        
-                        # Include timing information for better monitoring
-                        current_time = datetime.now()
-                        elapsed_time = (current_time - batch_start_time).total_seconds()
-                        remaining_targets = len(target_list) - (i + len(batch))
-                        
-                        # Calculate estimated time remaining
-                        if success_count + failure_count > 0 and elapsed_time > 0:
-                            targets_per_second = (success_count + failure_count) / elapsed_time
-                            estimated_time_remaining = remaining_targets / targets_per_second if targets_per_second > 0 else 0
-                            time_remaining_str = format_time_remaining(int(estimated_time_remaining))
-                        else:
-                            time_remaining_str = "Calculating..."
-                        
-                        # Update monitor with comprehensive status
-                        self.monitor.update_campaign(campaign_marker, {
-                            "total_sent": current_sent,
-                            "failed_sends": current_failed,
-                            "current_failures": current_failures,
-                            "status": "sending",
-                            "progress": f"Processed {i + len(batch)}/{len(target_list)} targets",
-                            "success_rate": f"{(success_count / (success_count + failure_count) * 100):.1f}%" if (success_count + failure_count) > 0 else "N/A",
-                            "estimated_time_remaining": time_remaining_str,
-                            "batch_progress": f"{len(batch)}/{batch_size} in current batch"
-                        })
-                
-                # Add delay between batches if not the last batch
-                if last_batch_index + batch_size < len(target_list):
-                    await asyncio.sleep(5)  # 5 second delay between batches
+                                # Add to error history (oldest entries drop off)
+                                if history_entry is not None:
+                                    failed_chat['error_history'].append(history_entry)
+                        except Exception as failed_chat_error:
+                            logger.error("Error updating failed chats system: %s", failed_chat_error)
+                    
+                    # One monitor update per batch with everything that happened in it
+                    # Include timing information for better monitoring
+                    current_time = datetime.now()
+                    elapsed_time = (current_time - batch_start_time).total_seconds()
+                    remaining_targets = len(target_list) - (i + len(batch))
+                    
+                    # Estimated seconds remaining (None while there is nothing to go on);
+                    # the dashboard formats it only when it is shown
+                    estimated_time_remaining = None
+                    if success_count + failure_count > 0 and elapsed_time > 0:
+                        targets_per_second = (success_count + failure_count) / elapsed_time
+                        estimated_time_remaining = remaining_targets / targets_per_second if targets_per_second > 0 else 0
+                    
+                    batch_update = {
+                        "current_failures": current_failures,
+                        "status": "sending",
+                        "last_update_time": current_time.strftime('%H:%M:%S'),
+                        "targets_processed": i + len(batch),
+                        "targets_total": len(target_list),
+                        "batch_index": i // batch_size,
+                        "batch_size": batch_size,
+                        "success_count": success_count,
+                        "failure_count": failure_count,
+                        "estimated_time_remaining": estimated_time_remaining,
+                    }
+                    if last_target is not None:
+                        batch_update["last_target"] = last_target
+                    if last_failed_target is not None:
+                        batch_update["last_failed_target"] = last_failed_target
+                        batch_update["last_error"] = last_error[:100]
+                    # Totals are incremented in place by the monitor - no read-then-write here
+                    self._safe_monitor_update(campaign_marker, batch_update, sent=batch_sent, failed=batch_failed)
+                    
+                    # Add delay between batches if not the last batch (flood control)
+                    if i + batch_size < len(target_list):
+                        await asyncio.sleep(5)  # 5 second delay between batches
 
                 # Get the most current campaign data
                 latest_campaign_data = self.monitor.get_campaign_data(campaign_marker) or {}
@@ -1481,52 +1891,150 @@ class MessageForwarder:
                 })
                 
                 # Log detailed statistics for debugging
-                logger.info(f"Campaign {campaign_marker} statistics updated - Round: {round_number}, Total sent: {total_sent}, Failed: {total_failed}")
+                logger.info("Campaign %s statistics updated - Round: %s, Total sent: %s, Failed: %s", campaign_marker, round_number, total_sent, total_failed)
 
-                logger.info(f"Round {round_number} completed: {success_count} successful, {failure_count} failed")
-                logger.info(f"Waiting {use_interval} seconds before next forward for message {msg_id}")
+                logger.info("Round %s completed: %s successful, %s failed", round_number, success_count, failure_count)
+                logger.info("Waiting %s seconds before next forward for message %s", use_interval, msg_id)
 
                 await asyncio.sleep(use_interval)
 
         except asyncio.CancelledError:
-            logger.info(f"Forwarding task for message {msg_id} was cancelled")
+            logger.info("Forwarding task for message %s was cancelled", msg_id)
             # Update monitor (use campaign_marker which was defined at the beginning of the function)
             if campaign_marker:
                 self.monitor.update_campaign_status(campaign_marker, "cancelled")
         except Exception as e:
-            logger.error(f"Error in forwarding task for message {msg_id}: {str(e)}")
+            logger.error("Error in forwarding task for message %s: %s", msg_id, e)
             # Update monitor (use campaign_marker which was defined at the beginning of the function)
             if campaign_marker:
                 self.monitor.update_campaign_status(campaign_marker, "error", {"error_message": str(e)})
 
-            # Remove task from active tasks
-            if msg_id in self._forwarding_tasks:
-                del self._forwarding_tasks[msg_id]
+    def _safe_monitor_update(self, marker, payload, sent=0, failed=0):
+        """Update a campaign's monitor data; a monitor error is logged and never stops forwarding"""
+        try:
+            self.monitor.increment_campaign(marker, sent, failed, **payload)
+        except Exception as e:
+            logger.error("Error updating monitor for %s: %s", marker, e)
+
+    @staticmethod
+    def _classify_target(target):
+        """Describe a target from its form alone: (info for logs, entity type)"""
+        if isinstance(target, int) or (isinstance(target, str) and target.lstrip('-').isdigit()):
+            target_str = str(target)
+            if target_str.startswith('-100'):
+                entity_type = "channel"
+            elif target_str.startswith('-'):
+                entity_type = "group"
+            else:
+                entity_type = "user"
+            return f"ID: {target}", entity_type
+        if isinstance(target, str):
+            if target.startswith('@'):
+                return target, "unknown"  # Already a username format
+            if 't.me/' in target:
+                return f"Link: {target}", "unknown"
+            return f"Chat: {target}", "unknown"
+        return "", "unknown"
+
+    def _target_info(self, target):
+        """Cached _classify_target - targets are re-sent every round, so classify each only once"""
+        meta = self._target_meta.get(target)
+        if meta is None:
+            meta = self._target_meta[target] = self._classify_target(target)
+        return meta
+
+    async def _forward_with_retry(self, target, message_id, from_peer, max_retries: int = 3):
+        """Forward one stored message to a target, retrying with exponential backoff plus jitter.
+
+        Returns None on success, or (error message, error category) for the last failed attempt.
+        """
+        for attempt in range(max_retries):
+            try:
+                # Check if target is a tuple (chat_id, topic_id)
+                if isinstance(target, tuple) and len(target) == 2:
+                    chat_id, topic_id = target
+                    logger.info("Forwarding to topic: chat_id=%s, topic_id=%s", chat_id, topic_id)
+
+                    # Use ForwardMessagesRequest for topics
+                    await self.client(ForwardMessagesRequest(
+                        from_peer=from_peer,
+                        id=[message_id],
+                        to_peer=chat_id,
+                        top_msg_id=topic_id  # Use topic_id as top_msg_id for forum topics
+                    ))
+                else:
+                    # Regular chat - use ForwardMessagesRequest with numeric IDs
+                    await self.client(ForwardMessagesRequest(
+                        from_peer=from_peer,
+                        id=[message_id],
+                        to_peer=target
+                    ))
+                logger.info("Successfully forwarded message to %s", target)
+                return None
+            except FloodWaitError as fw:
+                # A long flood wait would hold a concurrency slot and stall the round - give up
+                # on this target now and let the next round retry it
+                if fw.seconds > self.RETRY_MAX_DELAY or attempt == max_retries - 1:
+                    logger.error("Rate limit hit when forwarding to %s (wait %ss), skipping until next round", target, fw.seconds)
+                    return str(fw), 'rate_limited'
+                # Telegram says exactly how long to back off - wait that instead of guessing
+                logger.error("Rate limit hit when forwarding to %s, waiting %ss", target, fw.seconds)
+                await asyncio.sleep(fw.seconds)
+            except Exception as e:
+                error_msg = str(e)
+                logger.error("Error forwarding to %s: %s", target, error_msg)
+                error_type = self._handle_forward_error(error_msg, target)
+
+                if attempt == max_retries - 1:
+                    return error_msg, error_type
+                # 1s, 2s, 4s ... capped, with jitter so concurrent retries don't line up
+                delay = min(self.RETRY_MAX_DELAY, self.RETRY_BASE_DELAY * (2 ** attempt))
+                await asyncio.sleep(delay + random.random() * 0.3)
+
+    # Error keywords and the category each one indicates
+    _ERR_MAP = {
+        'banned': 'banned', 'restrict': 'banned',
+        'not found': 'not_found', 'invalid': 'not_found',
+        'private': 'access_denied', 'access': 'access_denied',
+        'permission': 'permission_denied', '403': 'permission_denied',
+        'too many': 'rate_limited', '420': 'rate_limited', 'flood': 'rate_limited',
+        'timeout': 'connection_error', 'disconnect': 'connection_error',
+        'too long': 'content_too_large', 'large': 'content_too_large',
+    }
+    _ERR_RE = re.compile('|'.join(map(re.escape, _ERR_MAP)))
+    # When several categories match, the first one listed here wins
+    _ERR_PRIORITY = ('banned', 'not_found', 'access_denied', 'permission_denied',
+                     'rate_limited', 'connection_error', 'content_too_large')
 
     def _classify_error(self, error_message):
         """Classify error message into categories for better analysis"""
-        error_message = error_message.lower()
-        
-        if "banned" in error_message or "restrict" in error_message:
-            return "banned"
-        elif "not found" in error_message or "invalid" in error_message:
-            return "not_found" 
-        elif "private" in error_message or "access" in error_message:
-            return "access_denied"
-        elif "permission" in error_message or "403" in error_message:
-            return "permission_denied"
-        elif "too many" in error_message or "420" in error_message or "flood" in error_message:
-            return "rate_limited"
-        elif "topic" in error_message and "not found" in error_message:
-            return "topic_not_found"
-        elif "message" in error_message and "not found" in error_message:
-            return "message_not_found"
-        elif "timeout" in error_message or "disconnect" in error_message:
-            return "connection_error"
-        elif "too long" in error_message or "large" in error_message:
-            return "content_too_large"
-        else:
+        return self._classify_lower(error_message.lower())
+
+    def _classify_lower(self, low):
+        """_classify_error for a message that is already lowercased"""
+        found = {self._ERR_MAP[keyword] for keyword in self._ERR_RE.findall(low)}
+        if not found:
             return "other"
+        if len(found) == 1:
+            return found.pop()
+        return next(category for category in self._ERR_PRIORITY if category in found)
+
+    # Extra log line for the failure categories worth calling out while forwarding
+    _FORWARD_ERROR_LOGS = {
+        'banned': "Target %s has banned the bot or the bot is banned from the channel",
+        'not_found': "Target %s was not found (may not exist)",
+        'access_denied': "Target %s is a private channel the bot cannot access",
+        'permission_denied': "Bot lacks permission to forward to %s",
+        'rate_limited': "Rate limit hit when forwarding to %s",
+    }
+
+    def _handle_forward_error(self, error_msg, target):
+        """Classify a forwarding error (lowercasing it once) and log the specific cause; returns the category"""
+        error_type = self._classify_lower(error_msg.lower())
+        detail = self._FORWARD_ERROR_LOGS.get(error_type)
+        if detail:
+            logger.error(detail, target)
+        return error_type
             
     def register_commands(self):
         """Register command handlers"""
@@ -1540,6 +2048,7 @@ class MessageForwarder:
                 'stop': self.cmd_stop,
                 'help': self.cmd_help,
                 'optimize': self.cmd_optimize,
+                'refreshme': self.cmd_refreshme,
 
                 # Message management
                 'setad': self.cmd_setad,
@@ -1591,280 +2100,142 @@ class MessageForwarder:
                 'client': self.cmd_client,
             }
 
-            for cmd, handler in commands.items():
-                pattern = f'^/{cmd}(?:\\s|$)'
-                self.client.add_event_handler(
-                    handler,
-                    events.NewMessage(pattern=pattern)
-                )
-                logger.info(f"Registered command: /{cmd}")
-
-            self._commands_registered = True
-            logger.info("All commands registered")
-        except Exception as e:
-            logger.error(f"Error registering commands: {str(e)}")
-            raise
-
-    @admin_only
-    async def cmd_start(self, event):
-        """Start the userbot and show welcome message with monitoring info"""
-        try:
-            # Use cached me info if available
-            if 'me' not in self._cache:
-                self._cache['me'] = await self.client.get_me()
-            me = self._cache['me']
-            username = "siimplebot1"  # Always use this fixed username
-            name = me.first_name if hasattr(me, 'first_name') else "Siimple"  # Use client name instead of user
-
-            # Enable the bot to respond to commands
-            self.forwarding_enabled = True
-
-            # Show loading animation
-            frames = [
-                "╔═══════ LOADING ═══════╗\n║    ⚡ □□□□□□□□□□ 0%    ║\n╚═════════════════════╝",
-                "╔═══════ LOADING ═══════╗\n║    ⚡ ■□□□□□□□□□ 10%   ║\n╚═════════════════════╝",
-                "╔═══════ LOADING ═══════╗\n║    ⚡ ■■□□□□□□□□ 20%   ║\n╚═════════════════════╝",
-                "╔═══════ LOADING ═══════╗\n║    ⚡ ■■■□□□□□□□ 30%   ║\n╚═════════════════════╝",
-                "╔═══════ LOADING ═══════╗\n║    ⚡ ■■■■□□□□□□ 40%   ║\n╚═════════════════════╝",
-                "╔═══════ LOADING ═══════╗\n║    ⚡ ■■■■■□□□□□ 50%   ║\n╚═════════════════════╝",
-                "╔═══════ LOADING ═══════╗\n║    ⚡ ■■■■■■□□□□ 60%   ║\n╚═════════════════════╝",
-                "╔═══════ LOADING ═══════╗\n║    ⚡ ■■■■■■■□□□ 70%   ║\n╚═════════════════════╝",
-                "╔═══════ LOADING ═══════╗\n║    ⚡ ■■■■■■■■□□ 80%   ║\n╚═════════════════════╝",
-                "╔═══════ LOADING ═══════╗\n║    ⚡ ■■■■■■■■■□ 90%   ║\n╚═════════════════════╝",
-                "╔═══════ LOADING ═══════╗\n║    ⚡ ■■■■■■■■■■ 100%  ║\n╚═════════════════════╝",
-                "╔══════ COMPLETED ═══════╗\n║     ✨ SUCCESS! ✨      ║\n╚═════════════════════╝"
-            ]
-            
-            msg = await event.reply(frames[0])
-            for frame in frames[1:]:
-                await asyncio.sleep(0.3)
-                await msg.edit(frame)
-            
-            await asyncio.sleep(0.5)
-            await msg.delete()
-
-            welcome_text = f"""
-╔═══════════════════════════╗
-║  🌟 WELCOME TO THE BEST   ║
-║  --Ꮪɪᴍṗʟᴇ'𝚜 𝙰𝙳𝙱𝙾𝚃 #1   ║
-║       @{username}         ║
-╚═══════════════════════════╝
-
-💫 Hey {name}! Ready to experience the ULTIMATE automation? 💫
-
-I am --Ꮪɪᴍṗʟᴇ'𝚜 𝙰𝙳𝙱𝙾𝚃, your ultimate Telegram assistant, built to make your experience smarter, faster, and way more fun! 🎭⚡
-
-💎 What I Can Do: 
-✅ Fast & Smart Automation ⚡ 
-✅ Fun Commands & Tools 🎭 
-✅ Instant Replies & Assistance 🤖 
-✅ Custom Features Just for You! 💡
-
-🎯 How to Use Me? 
-🔹 Type `/help` to explore my powers! 
-🔹 Want to chat? Just send a message & see the magic! 
-🔹 Feeling bored? Try my fun commands and enjoy the ride!
-
-💬 Mood: Always ready to assist! 
-⚡ Speed: Faster than light! 
-🎭 Vibe: Smart, cool & interactive!
-
-I'm here to make your Telegram experience legendary! 🚀💙 Stay awesome, and let's get started! 😎🔥
-"""
-            await event.reply(welcome_text)
-
-            # Send a dashboard with current status if there are active campaigns
-            if self.monitor.get_active_campaign_count() > 0:
-                dashboard_text = self.monitor.generate_dashboard()
-                await event.reply(dashboard_text)
-
-            logger.info("Start command executed - Bot activated")
-        except Exception as e:
-            logger.error(f"Error in start command: {str(e)}")
-            await event.reply(f"❌ Error: {str(e)}")
-
-    @admin_only
-    async def cmd_stop(self, event):
-        """Stop all active forwarding tasks and disable command responses"""
-        try:
-            # Get client name for personalized message
-            me = await self.client.get_me()
-            name = me.first_name if hasattr(me, 'first_name') else "Siimple"  # Use client name instead of user
-
-            # Cancel all forwarding tasks
-            for task_id, task in list(self._forwarding_tasks.items()):
-                if not task.done():
-                    task.cancel()
-            self._forwarding_tasks.clear()
-
-            # Cancel all scheduled tasks
-            for task_id, task in list(self.scheduled_tasks.items()):
-                if not task.done():
-                    task.cancel()
-            self.scheduled_tasks.clear()
-
-            # Clear targeted campaigns
-            self.targeted_campaigns.clear()
-
-            # Disable command responses (except for /start)
-            self.forwarding_enabled = False
-
-            # Show shutdown animation
-            frames = [
-                "╔═══════ SHUTDOWN ═══════╗\n║    🔴 ■■■■■■■■■■ 100%  ║\n╚═════════════════════╝",
-                "╔═══════ SHUTDOWN ═══════╗\n║    🔴 ■■■■■■■■■□ 90%   ║\n╚═════════════════════╝",
-                "╔═══════ SHUTDOWN ═══════╗\n║    🔴 ■■■■■■■■□□ 80%   ║\n╚═════════════════════╝",
-                "╔═══════ SHUTDOWN ═══════╗\n║    🔴 ■■■■■■■□□□ 70%   ║\n╚═════════════════════╝",
-                "╔═══════ SHUTDOWN ═══════╗\n║    🔴 ■■■■■■□□□□ 60%   ║\n╚═════════════════════╝",
-                "╔═══════ SHUTDOWN ═══════╗\n║    🔴 ■■■■■□□□□□ 50%   ║\n╚═════════════════════╝",
-                "╔═══════ SHUTDOWN ═══════╗\n║    🔴 ■■■■□□□□□□ 40%   ║\n╚═════════════════════╝",
-                "╔═══════ SHUTDOWN ═══════╗\n║    🔴 ■■■□□□□□□□ 30%   ║\n╚═════════════════════╝",
-                "╔═══════ SHUTDOWN ═══════╗\n║    🔴 ■■□□□□□□□□ 20%   ║\n╚═════════════════════╝",
-                "╔═══════ SHUTDOWN ═══════╗\n║    🔴 ■□□□□□□□□□ 10%   ║\n╚═════════════════════╝",
-                "╔═══════ SHUTDOWN ═══════╗\n║    🔴 □□□□□□□□□□ 0%    ║\n╚═════════════════════╝",
-                "╔══════ TERMINATED ══════╗\n║      💤 OFFLINE 💤      ║\n╚═════════════════════╝"
-            ]
-            
-            msg = await event.reply(frames[0])
-            for frame in frames[1:]:
-                await asyncio.sleep(0.3)
-                await msg.edit(frame)
-            
-            await asyncio.sleep(0.5)
-            await msg.delete()
-
-            stop_message = f"""⚠️ --Ꮪɪᴍṗʟᴇ'𝚜 𝙰𝙳𝙱𝙾𝚃 SYSTEM SHUTDOWN ⚠️
-
-Hey {name}! 😔 Looks like you've decided to stop me... but don't worry, I'll be here whenever you need me! 🚀
+            # One handler with one precompiled pattern for every command instead of a
+            # handler (and a regex match) per command for each incoming message
+            command_re = re.compile(r'^/(' + '|'.join(map(re.escape, commands)) + r')(?:\s|$)')
 
-📌 Bot Status: ⚠️ Going Offline for You
-📌 Commands Disabled: ❌ No More Assistance
-📌 Mood: 💤 Entering Sleep Mode
-
-💡 Want to wake me up again?
-Just type `/start`, and I'll be back in action, ready to assist you! 🔥
-
-Until then, stay awesome & take care! 😎
-
-🚀 Powered by --Ꮪɪᴍṗʟᴇ'𝚜 𝙰𝙳𝙱𝙾𝚃 (@siimplebot1)
-"""
-            await event.reply(stop_message)
-            logger.info("Stop command executed - Bot deactivated")
-        except Exception as e:
-            logger.error(f"Error in stop command: {str(e)}")
-            await event.reply(f"❌ Error: {str(e)}")
-
-    @admin_only
-    async def cmd_help(self, event):
-        """Show help message with animation"""
-        try:
-            me = await self.client.get_me()
-            username = "siimplebot1"  # Always use this fixed username
-            name = me.first_name if hasattr(me, 'first_name') else "Siimple"  # Use client name instead of user
-
-            # Show loading animation
-            help_msg = await event.reply("🔄 Loading Command Center...")
-            await asyncio.sleep(0.7)
-
-            frames = [
-                "⚡ Initializing Help System...",
-                "🔍 Gathering Commands...",
-                "📝 Formatting Guide...",
-                "✨ Preparing Display..."
-            ]
-
-            for frame in frames:
-                await help_msg.edit(frame)
-                await asyncio.sleep(0.7)
-
-            # Delete the loading message
-            await help_msg.delete()
+            async def route_command(event):
+                await commands[event.pattern_match.group(1)](event)
 
-            help_text = f"""🚀🔥 WELCOME TO --Ꮪɪᴍṗʟᴇ'𝚜 𝙰𝙳𝙱𝙾𝚃 COMMAND CENTER 🔥🚀
-
-Hey {name}! 😎 Ready to take control? Here's what I can do for you! ⚡
-
-━━━━━━━━━━━━━━━━━━━━━━
-
-🌟 BASIC COMMANDS
-🔹 `/start` – 🚀 Activate the bot
-🔹 `/stop` – 🛑 Deactivate the bot
-🔹 `/help` – 📜 Show all available commands
-🔹 `/client` – 🤖 Get details about your client
-🔹 `/optimize` – 🚀 Reset and optimize performance
-🔹 `/optimize --fast` – ⚡ Optimize with fast mode (no delays)
-
-━━━━━━━━━━━━━━━━━━━━━━
-
-📢 ADVERTISEMENT MANAGEMENT
-📌 Run powerful ad campaigns with ease!
-🔹 `/setad` <reply to message> – 📝 Set an ad
-🔹 `/listad` – 📋 View all ads
-🔹 `/removead` <ID> – ❌ Remove a specific ad
-🔹 `/startad` <ID> <interval> – 🚀 Start an ad campaign
-🔹 `/stopad` <ID> – ⏹ Stop an ad campaign
-🔹 `/timer` <seconds> – ⏱️ Set default forward interval
-🔹 `/schedule` <msg_id> <time> – 📆 Schedule a message
+            self.client.add_event_handler(
+                route_command,
+                events.NewMessage(pattern=command_re)
+            )
 
-━━━━━━━━━━━━━━━━━━━━━━
+            self._commands_registered = True
+            logger.info("Registered %d commands: %s", len(commands), ", ".join(f"/{cmd}" for cmd in commands))
+        except Exception as e:
+            logger.error(f"Error registering commands: {str(e)}")
+            raise
 
-🎯 TARGETING & AUDIENCE MANAGEMENT
-📌 Reach the right audience with precision!
-🔹 `/addtarget` <targets> – ➕ Add target audience
-🔹 `/listtarget` – 📜 View all targets
-🔹 `/removetarget` <id 1,2,3> – ❌ Remove specific targets
-🔹 `/removealltarget` – 🧹 Clear all targets
-🔹 `/cleantarget` – ✨ Clean up target list
+    async def _get_me(self):
+        """Our own account - fetched once per session and cached; /refreshme reloads it"""
+        me = self._cache.get('me')
+        if me is None:
+            me = self._cache['me'] = await self.client.get_me()
+        return me
+
+    @staticmethod
+    async def _cancel_and_wait(tasks):
+        """Cancel the unfinished tasks and wait for them to unwind, so nothing cancelled stays pinned; returns how many"""
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        return len(pending)
+
+    def _evict_forwarding_task(self, key):
+        """Done-callback that removes a finished task from _forwarding_tasks, unless it was already replaced"""
+        def evict(task):
+            if self._forwarding_tasks.get(key) is task:
+                del self._forwarding_tasks[key]
+        return evict
+
+    def _campaign_suffix(self):
+        """Unique campaign ID suffix - monotonic clock plus a sequence number, immune to wall-clock jumps"""
+        self._campaign_seq += 1
+        return f"{time.monotonic_ns()}_{self._campaign_seq}"
+
+    async def _play_animation(self, event, frames, delay, final_delay):
+        """Play frames in a throwaway reply, then delete it; skipped entirely unless animations are enabled"""
+        if not self.animations_enabled:
+            return
+        msg = await event.reply(frames[0])
+        for frame in frames[1:]:
+            await asyncio.sleep(delay)
+            await msg.edit(frame)
+        await asyncio.sleep(final_delay)
+        await msg.delete()
+
+    async def _play_phases(self, message, phases, delay):
+        """Step a status message through phases before its final edit; skipped unless animations are enabled"""
+        if not self.animations_enabled:
+            return
+        for phase in phases:
+            await message.edit(phase)
+            await asyncio.sleep(delay)
 
-━━━━━━━━━━━━━━━━━━━━━━
+    @admin_only
+    async def cmd_start(self, event):
+        """Start the userbot and show welcome message with monitoring info"""
+        try:
+            # Use cached me info if available
+            me = await self._get_me()
+            username = "siimplebot1"  # Always use this fixed username
+            name = getattr(me, 'first_name', "Siimple")  # Use client name instead of user
 
-🏠 GROUP & CHAT MANAGEMENT
-📌 Effortlessly manage groups and chats!
-🔹 `/joinchat` <chats> – 🔗 Join a chat/group
-🔹 `/leavechat` <chats> – 🚪 Leave a chat/group
-🔹 `/leaveallchat` – 🧹 Leave all groups and channels
-🔹 `/listjoined` – 📋 View joined groups
-🔹 `/listjoined --all` – 📜 View all targeted joined groups
-🔹 `/clearchat` [count] – 🧹 Clear messages
-🔹 `/pin` [silent] – 📌 Pin a message silently
+            # Enable the bot to respond to commands
+            self.forwarding_enabled = True
 
-━━━━━━━━━━━━━━━━━━━━━━
+            # Show loading animation
+            await self._play_animation(event, _START_FRAMES, 0.3, 0.5)
 
-👤 USER PROFILE & CUSTOMIZATION
-📌 Make your profile stand out!
-🔹 `/bio` <text> – 📝 Set a new bio
-🔹 `/name` <first_name> <last_name> – 🔄 Change your name
-🔹 `/username` <new_username> – 🔀 Change your username
-🔹 `/setpic` – 🖼 Set profile picture
+            welcome_text = _WELCOME_TEMPLATE.replace("{name}", name).replace("{username}", username)
+            await event.reply(welcome_text)
 
-━━━━━━━━━━━━━━━━━━━━━━
+            # Send a dashboard with current status if there are active campaigns
+            if self.monitor.get_active_campaign_count() > 0:
+                dashboard_text = self.monitor.generate_dashboard()
+                await event.reply(dashboard_text)
 
-🔑 ADMIN CONTROLS
-📌 Manage bot admins easily!
-🔹 `/addadmin` <user_id> <username> – ➕ Add an admin
-🔹 `/removeadmin` <user_id> <username> – ❌ Remove an admin
-🔹 `/listadmins` – 📜 View all admins
+            logger.info("Start command executed - Bot activated")
+        except Exception as e:
+            logger.error(f"Error in start command: {str(e)}")
+            await event.reply(f"❌ Error: {str(e)}")
 
-━━━━━━━━━━━━━━━━━━━━━━
+    @admin_only
+    async def cmd_stop(self, event):
+        """Stop all active forwarding tasks and disable command responses"""
+        try:
+            # Get client name for personalized message
+            me = await self._get_me()
+            name = getattr(me, 'first_name', "Siimple")  # Use client name instead of user
 
-📊 MONITORING
-📌 Track your campaigns!
-🔹 `/monitor` – 📊 Show campaign dashboard
-🔹 `/failedchats` – 📋 View chats with failed deliveries
-🔹 `/retryfailed` – 🔄 Retry sending to failed chats
-🔹 `/removefailed` – 🧹 Clear failed chats list
+            # Cancel all forwarding and scheduled tasks and wait for them to finish unwinding
+            await self._cancel_and_wait([*self._forwarding_tasks.values(), *self.scheduled_tasks.values()])
+            self._forwarding_tasks.clear()
+            self._msgid_to_campaign.clear()
+            self.scheduled_tasks.clear()
 
-━━━━━━━━━━━━━━━━━━━━━━
+            # Clear targeted campaigns
+            self.targeted_campaigns.clear()
 
-💡 Need Help?
-Type `/help` anytime to get assistance!
+            # Disable command responses (except for /start)
+            self.forwarding_enabled = False
 
-━━━━━━━━━━━━━━━━━━━━━━
+            # Show shutdown animation
+            await self._play_animation(event, _SHUTDOWN_FRAMES, 0.3, 0.5)
 
-🔥 Powered by --Ꮪɪᴍṗʟᴇ'𝚜 𝙰𝙳𝙱𝙾𝚃 (@{username})
+            stop_message = _STOP_TEMPLATE.replace("{name}", name)
+            await event.reply(stop_message)
+            logger.info("Stop command executed - Bot deactivated")
+        except Exception as e:
+            logger.error(f"Error in stop command: {str(e)}")
+            await event.reply(f"❌ Error: {str(e)}")
 
-🚀 Stay Smart, Stay Automated!
-"""
+    @admin_only
+    async def cmd_help(self, event):
+        """Show help message with animation"""
+        try:
+            me = await self._get_me()
+            username = "siimplebot1"  # Always use this fixed username
+            name = getattr(me, 'first_name', "Siimple")  # Use client name instead of user
+
+            # Show loading animation
+            await self._play_animation(event, _HELP_FRAMES, 0.7, 0.7)
+
+            help_text = _HELP_TEMPLATE.replace("{name}", name).replace("{username}", username)
             await event.reply(help_text)
             logger.info("Help message sent")
         except Exception as e:
@@ -1873,37 +2244,33 @@ Type `/help` anytime to get assistance!
 
 
 
+    @admin_only
+    async def cmd_refreshme(self, event):
+        """Reload the cached account details (e.g. after a name change)"""
+        try:
+            me = self._cache['me'] = await self.client.get_me()
+            name = getattr(me, 'first_name', "Siimple")
+            await event.reply(f"✅ Account details refreshed - hey {name}!")
+            logger.info("Refreshme command executed")
+        except Exception as e:
+            logger.error(f"Error in refreshme command: {str(e)}")
+            await event.reply(f"❌ Error: {str(e)}")
+
     @admin_only
     async def cmd_optimize(self, event):
         """Reset and optimize userbot performance by clearing all data"""
         try:
             # Show reset animation
-            msg = await event.reply("🚀 SYSTEM RESET IN PROGRESS\n\n⚡ Phase 1: Analyzing System...")
-            await asyncio.sleep(1)
-            await msg.edit("🚀 SYSTEM RESET IN PROGRESS\n\n⚡ Phase 2: Preparing for Reset...")
-            await asyncio.sleep(1)
-            await msg.edit("🚀 SYSTEM RESET IN PROGRESS\n\n⚡ Phase 3: Backing Up Critical Data...")
-            await asyncio.sleep(1)
-            await msg.edit("🚀 SYSTEM RESET IN PROGRESS\n\n⚡ Phase 4: Clearing All Data...")
-            await asyncio.sleep(1)
-            await msg.edit("🚀 SYSTEM RESET IN PROGRESS\n\n⚡ Phase 5: Finalizing Reset...")
-            await asyncio.sleep(1)
+            await self._play_animation(event, _OPTIMIZE_PHASES, 1, 1)
 
             # Cancel all active tasks
-            active_task_count = 0
-            for task_id, task in list(self._forwarding_tasks.items()):
-                if not task.done():
-                    task.cancel()
-                    active_task_count += 1
-                del self._forwarding_tasks[task_id]
+            active_task_count = await self._cancel_and_wait(list(self._forwarding_tasks.values()))
+            self._forwarding_tasks.clear()
+            self._msgid_to_campaign.clear()
 
             # Cancel all scheduled tasks
-            scheduled_task_count = 0
-            for task_id, task in list(self.scheduled_tasks.items()):
-                if not task.done():
-                    task.cancel()
-                    scheduled_task_count += 1
-                del self.scheduled_tasks[task_id]
+            scheduled_task_count = await self._cancel_and_wait(list(self.scheduled_tasks.values()))
+            self.scheduled_tasks.clear()
 
             # Clear all stored messages
             stored_msg_count = len(self.stored_messages)
@@ -1912,6 +2279,7 @@ Type `/help` anytime to get assistance!
             # Clear all target chats
             target_count = len(self.target_chats)
             self.target_chats.clear()
+            self._targets_version += 1
 
             # Clear all targeted campaigns
             campaign_count = len(self.targeted_campaigns)
@@ -1919,9 +2287,9 @@ Type `/help` anytime to get assistance!
 
             # Reset analytics data
             self.analytics = {
-                "start_time": time.time(),
-                "forwards": {},
-                "failures": {}
+                "start_time": time.monotonic(),
+                "forwards": defaultdict(lambda: defaultdict(int)),
+                "failures": defaultdict(lambda: defaultdict(list))
             }
 
             # Reset monitor data
@@ -1953,27 +2321,11 @@ Type `/help` anytime to get assistance!
             self.forwarding_enabled = True
 
             # Final completion message with animation
-            await msg.delete()
-            
-            frames = [
-                "🔄 Finalizing Reset...",
-                "✨ Clearing Memory...",
-                "🧹 Cleaning Up...",
-                "🔧 Reconfiguring...",
-                "✅ Reset Complete!"
-            ]
-            
-            reset_msg = await event.reply(frames[0])
-            for frame in frames[1:]:
-                await asyncio.sleep(0.7)
-                await reset_msg.edit(frame)
-            
-            await asyncio.sleep(0.7)
-            await reset_msg.delete()
+            await self._play_animation(event, _RESET_FRAMES, 0.7, 0.7)
 
             # Get client name for personalized message
-            me = await self.client.get_me()
-            name = me.first_name if hasattr(me, 'first_name') else "Siimple"
+            me = await self._get_me()
+            name = getattr(me, 'first_name', "Siimple")
 
             result = f"""✅ **COMPLETE SYSTEM RESET**
 
@@ -2040,21 +2392,20 @@ Your bot is now fresh and ready for a new start! 🚀
                 await event.reply("📝 No messages are currently saved")
                 return
 
-            result = "📝 **Saved Messages**:\n\n"
-
-            for msg_id, message in self.stored_messages.items():
-                # Get message preview (limited to 50 chars)
-                content = ""
-                if message.text:
-                    content = message.text[:50] + ("..." if len(message.text) > 50 else "")
-                elif message.media:
-                    content = "[Media Message]"
-                else:
-                    content = "[Unknown Content]"
-
-                result += f"• ID: `{msg_id}` - {content}\n"
+            def preview(message):
+                """Message preview (limited to 50 chars)"""
+                text = message.text
+                if text:
+                    return text[:50] + ("..." if len(text) > 50 else "")
+                return "[Media Message]" if message.media else "[Unknown Content]"
+
+            # One join over all ads instead of growing the string line by line
+            result = "📝 **Saved Messages**:\n\n" + "".join(
+                f"• ID: `{msg_id}` - {preview(message)}\n"
+                for msg_id, message in self.stored_messages.items()
+            )
 
-            await event.reply(result)
+            await event.reply(_safe_truncate(result))
             logger.info("Listed all saved messages")
         except Exception as e:
             logger.error(f"Error in listad command: {str(e)}")
@@ -2064,7 +2415,7 @@ Your bot is now fresh and ready for a new start! 🚀
     async def cmd_removead(self, event):
         """Remove a saved message"""
         try:
-            command_parts = event.text.split()
+            command_parts = event.text.split(maxsplit=2)
             if len(command_parts) != 2:
                 await event.reply("❌ Please provide a message ID\nFormat: /removead <message_id>")
                 return
@@ -2075,11 +2426,15 @@ Your bot is now fresh and ready for a new start! 🚀
                 await event.reply(f"❌ Message with ID {msg_id} not found")
                 return
 
-            # Cancel any active forwarding tasks for this message
-            for task_id, task in list(self._forwarding_tasks.items()):
-                if task_id == msg_id and not task.done():
-                    task.cancel()
-                    del self._forwarding_tasks[task_id]
+            # Cancel any active forwarding task for this message and wait for it to unwind
+            campaign_id = self._msgid_to_campaign.pop(msg_id, None)
+            if msg_id in self._forwarding_tasks and not self._forwarding_tasks[msg_id].done():
+                await self._cancel_and_wait([self._forwarding_tasks.pop(msg_id)])
+
+                # Mark the campaign stopped like /stopad <id> does
+                if campaign_id and self.monitor.campaign_exists(campaign_id):
+                    self.monitor.update_campaign_status(campaign_id, "stopped")
+                    self.monitor.stop_live_monitor(campaign_id)
 
             # Remove from stored messages
             del self.stored_messages[msg_id]
@@ -2094,7 +2449,7 @@ Your bot is now fresh and ready for a new start! 🚀
     async def cmd_startad(self, event):
         """Start forwarding a specific message at an interval with automatic monitoring"""
         try:
-            command_parts = event.text.split()
+            command_parts = event.text.split(maxsplit=3)
             msg_id = "default"  # Default value
             interval = self.forward_interval  # Default interval
 
@@ -2125,18 +2480,17 @@ Your bot is now fresh and ready for a new start! 🚀
                 return
 
             # Cancel existing task if any
-            if msg_id in self._forwarding_tasks and not self._forwarding_tasks[msg_id].done():
-                self._forwarding_tasks[msg_id].cancel()
+            if msg_id in self._forwarding_tasks:
+                await self._cancel_and_wait([self._forwarding_tasks.pop(msg_id)])
 
-            # Create campaign ID for monitoring - unique format to match the one used in forward_stored_message
-            timestamp = int(time.time())
-            campaign_id = f"adcampaign_{msg_id}_{timestamp}"
+            # Campaign ID used for the monitor, the forwarding task and the live monitor alike
+            campaign_id = f"adcampaign_{msg_id}_{self._campaign_suffix()}"
 
             # Show animated initialization message
             monitor_message = await event.reply("🔄 **Initializing Campaign...**")
             
             # Log campaign ID for debugging
-            logger.info(f"Creating campaign with ID: {campaign_id} for message {msg_id}")
+            logger.info("Creating campaign with ID: %s for message %s", campaign_id, msg_id)
 
             # Animation phases
             phases = [
@@ -2148,9 +2502,7 @@ Your bot is now fresh and ready for a new start! 🚀
             ]
 
             # Display animation
-            for phase in phases:
-                await monitor_message.edit(phase)
-                await asyncio.sleep(0.8)  # Short delay between updates
+            await self._play_phases(monitor_message, phases, 0.8)
 
             # Add to monitor dashboard
             self.monitor.add_campaign(campaign_id, {
@@ -2165,19 +2517,16 @@ Your bot is now fresh and ready for a new start! 🚀
                 "is_active": True
             })
 
-            # Create the campaign ID for both starting the task and monitoring
-            # This ensures a consistent campaign ID
-            campaign_id = f"adcampaign_{msg_id}_{timestamp}"
-            logger.info(f"Starting forwarding task with campaign_id: {campaign_id}")
-            
             # Start new forwarding task with the pre-defined campaign_id to ensure consistency
-            self._forwarding_tasks[msg_id] = asyncio.create_task(
+            task = asyncio.create_task(
                 self.forward_stored_message(msg_id=msg_id, interval=interval, campaign_id=campaign_id)
             )
+            self._forwarding_tasks[msg_id] = task
+            # Finished tasks drop out of _forwarding_tasks by themselves
+            task.add_done_callback(self._evict_forwarding_task(msg_id))
             
-            # Store a reference to the campaign marker for monitoring
-            self._forwarding_task_campaigns = getattr(self, '_forwarding_task_campaigns', {})
-            self._forwarding_task_campaigns[msg_id] = campaign_id
+            # Remember which campaign this ad runs under so /stopad can find it directly
+            self._msgid_to_campaign[msg_id] = campaign_id
 
             # Success message
             await monitor_message.edit(f"""🚀 **Ad Campaign Started!** 🚀
@@ -2199,13 +2548,8 @@ Use `/stopad {msg_id}` to stop it anytime.
             # Create a live monitoring message that will continuously update
             live_monitor_message = await event.reply("📊 **Starting Live Monitor...**")
             
-            # Use the actual campaign marker that will be generated in forward_stored_message
-            # This ensures we're monitoring the right campaign data
-            actual_campaign_id = f"adcampaign_{msg_id}_{timestamp}"
-            logger.info(f"Starting live monitor for actual campaign ID: {actual_campaign_id}")
-            
             # Start live monitoring for this campaign - this continuously updates the message
-            await self.monitor.start_live_monitor(actual_campaign_id, live_monitor_message, event.chat_id)
+            await self.monitor.start_live_monitor(campaign_id, live_monitor_message, event.chat_id)
 
             logger.info(f"Forwarding enabled for message {msg_id}. Interval: {interval}s, Targets: {self.target_chats}")
         except Exception as e:
@@ -2216,7 +2560,7 @@ Use `/stopad {msg_id}` to stop it anytime.
     async def cmd_stopad(self, event):
         """Stop forwarding a specific message with animation"""
         try:
-            command_parts = event.text.split()
+            command_parts = event.text.split(maxsplit=2)
 
             # Initial animation message
             stop_message = await event.reply("🔄 **Processing Stop Request...**")
@@ -2240,20 +2584,20 @@ Use `/stopad {msg_id}` to stop it anytime.
             # If no ID specified, stop all forwarding
             if len(command_parts) == 1:
                 # Show animation
-                for phase in all_stop_phases:
-                    await stop_message.edit(phase)
-                    await asyncio.sleep(0.8)  # Short delay between updates
+                await self._play_phases(stop_message, all_stop_phases, 0.8)
 
                 # Find all campaigns in the monitor
                 active_campaigns = self.monitor.list_active_campaigns()
 
-                # Cancel all forwarding tasks and update monitor
-                for task_id, task in list(self._forwarding_tasks.items()):
-                    if not task.done():
-                        task.cancel()
-                        # Update monitor if this task ID is a campaign
-                        if self.monitor.campaign_exists(task_id):
-                            self.monitor.update_campaign_status(task_id, "stopped")
+                # Cancel all forwarding tasks, wait for them to unwind, then update monitor
+                running = {task_id: task for task_id, task in self._forwarding_tasks.items() if not task.done()}
+                await self._cancel_and_wait(list(running.values()))
+                for task_id in running:
+                    # /startad tasks are keyed by ad ID, targeted ones by their campaign ID
+                    task_campaign = self._msgid_to_campaign.get(task_id, task_id)
+                    if self.monitor.campaign_exists(task_campaign):
+                        self.monitor.update_campaign_status(task_campaign, "stopped")
+                self._msgid_to_campaign.clear()
 
                 # Stop all active monitoring
                 self.monitor.stop_all_monitoring()
@@ -2279,20 +2623,13 @@ Use `/stopad {msg_id}` to stop it anytime.
             msg_id = command_parts[1]
 
             # Show animation for specific campaign stop
-            for phase in specific_stop_phases:
-                await stop_message.edit(phase)
-                await asyncio.sleep(0.8)  # Short delay between updates
+            await self._play_phases(stop_message, specific_stop_phases, 0.8)
 
             # Find associated campaign ID if any
-            campaign_id = None
-            for c_id in self.monitor.list_campaigns():
-                if self.monitor.get_campaign_data(c_id).get('msg_id') == msg_id:
-                    campaign_id = c_id
-                    break
+            campaign_id = self._msgid_to_campaign.pop(msg_id, None)
 
             if msg_id in self._forwarding_tasks and not self._forwarding_tasks[msg_id].done():
-                self._forwarding_tasks[msg_id].cancel()
-                del self._forwarding_tasks[msg_id]
+                await self._cancel_and_wait([self._forwarding_tasks.pop(msg_id)])
 
                 # Update monitor if we found a campaign
                 if campaign_id and self.monitor.campaign_exists(campaign_id):
@@ -2334,7 +2671,7 @@ Use `/stopad {msg_id}` to stop it anytime.
     async def cmd_timer(self, event):
         """Set default forwarding interval in seconds"""
         try:
-            command_parts = event.text.split()
+            command_parts = event.text.split(maxsplit=2)
             if len(command_parts) != 2:
                 await event.reply("❌ Please provide a valid interval in seconds\nFormat: /timer <seconds>")
                 return
@@ -2359,7 +2696,7 @@ Use `/stopad {msg_id}` to stop it anytime.
     async def cmd_targetedad(self, event):
         """Start a targeted ad campaign with specific message, targets and interval with monitoring"""
         try:
-            command_parts = event.text.split()
+            command_parts = event.text.split(maxsplit=4)
             usage = "❌ Format: /targetedad <ad_id> <target_list> <interval>\n\nExample: /targetedad ABC123 target1,target2 3600"
 
             if len(command_parts) < 3:
@@ -2375,143 +2712,122 @@ Use `/stopad {msg_id}` to stop it anytime.
                 return
 
             # Parse targets - No confirmations, just process immediately
-            targets = set()
-            for target in target_str.split(','):
-                target = target.strip()
-                if not target:
-                    continue
+            target_items = [target.strip() for target in target_str.split(',') if target.strip()]
 
-                # Check if it's a topic link (t.me/channel/topicID)
-                topic_match = re.search(r't\.me/([^/]+)/(\d+)', target)
-                if topic_match:
-                    channel_name, topic_id = topic_match.groups()
-                    try:
-                        # Extract channel link and send a message to get the channel ID
-                        channel_link = f"t.me/{channel_name}"
-                        # Instead of get_entity, we'll try to resolve through other methods
-                        # First try to find the channel in dialogs
-                        channel_id = None
-                        async for dialog in self.client.iter_dialogs():
-                            if dialog.entity.username and dialog.entity.username.lower() == channel_name.lower():
-                                channel_id = dialog.entity.id
-                                break
-                                
-                        # If not found, try to send a message which will be auto-deleted
-                        if not channel_id:
-                            try:
-                                # Join the channel first if needed
-                                await self.client(JoinChannelRequest(channel_link))
-                                await asyncio.sleep(2)
-                                
-                                # Send a temporary message to get the channel ID
-                                temp_msg = await self.client.send_message(channel_link, ".")
-                                channel_id = temp_msg.peer_id.channel_id
-                                # Delete the temp message immediately
-                                await temp_msg.delete()
-                            except Exception as e:
-                                logger.error(f"Error resolving channel ID for {channel_name}: {e}")
-                                
-                        # If still not resolved, use a fallback method or inform user
-                        if not channel_id:
-                            raise ValueError(f"Could not resolve channel ID for {channel_name}")
-                            
-                        topic_id = int(topic_id)
-                        # Store as a tuple (chat_id, topic_id)
-                        targets.add((channel_id, topic_id))
-                        logger.info(f"Added topic target: channel={channel_id}, topic={topic_id}")
-                    except Exception as e:
-                        logger.error(f"Error resolving topic target {target}: {str(e)}")
-                        await event.reply(f"❌ Could not resolve topic target: {target}")
-                        return
-                else:
-                    try:
-                        # Try as numeric ID
-                        chat_id = int(target)
-                        targets.add(chat_id)
-                    except ValueError:
-                        # Try as username or link without get_entity
+            # Username index of our dialogs, fetched once up front if any target is looked up by name
+            dialog_index = {}
+            if any(target.startswith('@') or 't.me/' in target for target in target_items):
+                dialog_index = await get_dialog_username_index(self.client)
+
+            # Targets resolve concurrently; the semaphore keeps joins and temp messages within flood limits
+            resolve_semaphore = asyncio.Semaphore(self.RESOLVE_CONCURRENCY)
+
+            async def _resolve(target):
+                """Resolve one target to a chat ID or (chat_id, topic_id); returns (resolved, error reply or None)"""
+                async with resolve_semaphore:
+                    # Check if it's a topic link (t.me/channel/topicID) - plain IDs and usernames skip the regex
+                    topic_match = _TME_TOPIC_RE.search(target) if 't.me/' in target else None
+                    if topic_match:
+                        channel_name, topic_id = topic_match.groups()
                         try:
-                            # For usernames, try to resolve through dialogs
-                            if target.startswith('@'):
-                                username = target[1:]  # Remove the @ sign
-                                resolved = False
-                                
-                                # Try to find in dialogs
-                                async for dialog in self.client.iter_dialogs():
-                                    if dialog.entity.username and dialog.entity.username.lower() == username.lower():
-                                        targets.add(dialog.entity.id)
-                                        resolved = True
-                                        break
-                                
-                                # If not found in dialogs, try to send a message
-                                if not resolved:
-                                    try:
-                                        # Try to send a temporary message
-                                        temp_msg = await self.client.send_message(target, ".")
-                                        if hasattr(temp_msg.peer_id, 'user_id'):
-                                            targets.add(temp_msg.peer_id.user_id)
-                                        elif hasattr(temp_msg.peer_id, 'channel_id'):
-                                            targets.add(temp_msg.peer_id.channel_id)
-                                        elif hasattr(temp_msg.peer_id, 'chat_id'):
-                                            targets.add(temp_msg.peer_id.chat_id)
-                                        else:
-                                            targets.add(temp_msg.peer_id)
-                                        # Delete the message right away
-                                        await temp_msg.delete()
-                                        resolved = True
-                                    except Exception as msg_err:
-                                        logger.error(f"Error resolving username with message: {msg_err}")
-                                
-                                if not resolved:
-                                    raise ValueError(f"Could not resolve username: {target}")
-                                    
-                            # For t.me links
-                            elif 't.me/' in target:
-                                # Try to join the chat first
+                            # Extract channel link and send a message to get the channel ID
+                            channel_link = f"t.me/{channel_name}"
+                            # Instead of get_entity, we'll try to resolve through other methods
+                            # First try to find the channel in dialogs
+                            channel_entity = dialog_index.get(channel_name.lower())
+                            channel_id = channel_entity.id if channel_entity is not None else None
+
+                            # If not found, try to send a message which will be auto-deleted
+                            if not channel_id:
                                 try:
-                                    await self.client(JoinChannelRequest(target))
-                                    await asyncio.sleep(1)
-                                except Exception as join_err:
-                                    logger.error(f"Error joining channel: {join_err}")
-                                
-                                # Try to send a temp message to get the ID
-                                try:
-                                    temp_msg = await self.client.send_message(target, ".")
-                                    if hasattr(temp_msg.peer_id, 'user_id'):
-                                        targets.add(temp_msg.peer_id.user_id)
-                                    elif hasattr(temp_msg.peer_id, 'channel_id'):
-                                        targets.add(temp_msg.peer_id.channel_id)
-                                    elif hasattr(temp_msg.peer_id, 'chat_id'):
-                                        targets.add(temp_msg.peer_id.chat_id)
-                                    else:
-                                        targets.add(temp_msg.peer_id)
-                                    # Delete the message right away
-                                    await temp_msg.delete()
-                                except Exception as e:
-                                    logger.error(f"Error resolving link with message: {e}")
-                                    raise ValueError(f"Could not resolve link: {target}")
-                            else:
-                                # For any other format, try direct message
-                                try:
-                                    temp_msg = await self.client.send_message(target, ".")
-                                    if hasattr(temp_msg.peer_id, 'user_id'):
-                                        targets.add(temp_msg.peer_id.user_id)
-                                    elif hasattr(temp_msg.peer_id, 'channel_id'):
-                                        targets.add(temp_msg.peer_id.channel_id)
-                                    elif hasattr(temp_msg.peer_id, 'chat_id'):
-                                        targets.add(temp_msg.peer_id.chat_id)
-                                    else:
-                                        targets.add(temp_msg.peer_id)
-                                    # Delete the message right away
-                                    await temp_msg.delete()
+                                    # Join the channel first if needed
+                                    joined = await self.client(JoinChannelRequest(channel_link))
+                                    remember_dialog_entities(self.client, getattr(joined, 'chats', ()))
+                                    await asyncio.sleep(2)
+
+                                    # Send a temporary message to get the channel ID
+                                    temp_msg = await self.client.send_message(channel_link, ".")
+                                    channel_id = temp_msg.peer_id.channel_id
+                                    # Delete the temp message immediately
+                                    await asyncio.shield(temp_msg.delete())  # Finish even if this resolve is cancelled
                                 except Exception as e:
-                                    logger.error(f"Error resolving chat: {e}")
-                                    raise ValueError(f"Could not resolve chat: {target}")
-                                
+                                    logger.error(f"Error resolving channel ID for {channel_name}: {e}")
+
+                            # If still not resolved, use a fallback method or inform user
+                            if not channel_id:
+                                raise ValueError(f"Could not resolve channel ID for {channel_name}")
+
+                            topic_id = int(topic_id)
+                            logger.info(f"Added topic target: channel={channel_id}, topic={topic_id}")
+                            # Store as a tuple (chat_id, topic_id)
+                            return (channel_id, topic_id), None
                         except Exception as e:
-                            logger.error(f"Error resolving target {target}: {str(e)}")
-                            await event.reply(f"❌ Could not resolve target: {target}")
-                            return
+                            logger.error(f"Error resolving topic target {target}: {str(e)}")
+                            return None, f"❌ Could not resolve topic target: {target}"
+
+                    try:
+                        # Try as numeric ID
+                        return int(target), None
+                    except ValueError:
+                        pass
+
+                    # Try as username or link without get_entity
+                    try:
+                        # For usernames, try to resolve through dialogs
+                        if target.startswith('@'):
+                            entity = dialog_index.get(target[1:].lower())  # Without the @ sign
+                            if entity is not None:
+                                return entity.id, None
+
+                            # If not found in dialogs, try to send a message
+                            try:
+                                temp_msg = await self.client.send_message(target, ".")
+                            except Exception as msg_err:
+                                logger.error(f"Error resolving username with message: {msg_err}")
+                                raise ValueError(f"Could not resolve username: {target}")
+
+                        # For t.me links
+                        elif 't.me/' in target:
+                            # Try to join the chat first
+                            try:
+                                joined = await self.client(JoinChannelRequest(target))
+                                remember_dialog_entities(self.client, getattr(joined, 'chats', ()))
+                                await asyncio.sleep(1)
+                            except Exception as join_err:
+                                logger.error(f"Error joining channel: {join_err}")
+
+                            # Try to send a temp message to get the ID
+                            try:
+                                temp_msg = await self.client.send_message(target, ".")
+                            except Exception as e:
+                                logger.error(f"Error resolving link with message: {e}")
+                                raise ValueError(f"Could not resolve link: {target}")
+                        else:
+                            # For any other format, try direct message
+                            try:
+                                temp_msg = await self.client.send_message(target, ".")
+                            except Exception as e:
+                                logger.error(f"Error resolving chat: {e}")
+                                raise ValueError(f"Could not resolve chat: {target}")
+
+                        peer_entity_id, _ = peer_to_id_and_type(temp_msg.peer_id)
+                        # Delete the message right away
+                        await asyncio.shield(temp_msg.delete())  # Finish even if this resolve is cancelled
+                        return (peer_entity_id if peer_entity_id is not None else temp_msg.peer_id), None
+                    except Exception as e:
+                        logger.error(f"Error resolving target {target}: {str(e)}")
+                        return None, f"❌ Could not resolve target: {target}"
+
+            targets = set()
+            resolve_tasks = [asyncio.create_task(_resolve(target)) for target in target_items]
+            for next_done in asyncio.as_completed(resolve_tasks):
+                resolved, error_reply = await next_done
+                if error_reply:
+                    # Stop the targets still resolving, so no further joins or probe messages go out
+                    await self._cancel_and_wait(resolve_tasks)
+                    await event.reply(error_reply)
+                    return
+                targets.add(resolved)
 
             if not targets:
                 await event.reply("❌ No valid targets specified")
@@ -2546,9 +2862,7 @@ Use `/stopad {msg_id}` to stop it anytime.
             ]
 
             # Display animation
-            for phase in phases:
-                await monitor_message.edit(phase)
-                await asyncio.sleep(0.7)  # Short delay between updates
+            await self._play_phases(monitor_message, phases, 0.7)
 
             # Store campaign info
             self.targeted_campaigns[campaign_id] = {
@@ -2583,6 +2897,7 @@ Use `/stopad {msg_id}` to stop it anytime.
             )
 
             self._forwarding_tasks[campaign_id] = task
+            task.add_done_callback(self._evict_forwarding_task(campaign_id))
 
             # Success message
             await monitor_message.edit(f"""🎯 **Targeted Campaign Started!** 🎯
@@ -2657,7 +2972,7 @@ Use `/stopad {msg_id}` to stop it anytime.
     async def cmd_stoptargetad(self, event):
         """Stop a targeted ad campaign with animation"""
         try:
-            command_parts = event.text.split()
+            command_parts = event.text.split(maxsplit=2)
             if len(command_parts) != 2:
                 await event.reply("❌ Please provide a campaign ID\nFormat: /stoptargetad <campaign_id>")
                 return
@@ -2676,9 +2991,7 @@ Use `/stopad {msg_id}` to stop it anytime.
             ]
 
             # Show animation for campaign stop
-            for phase in stop_phases:
-                await stop_message.edit(phase)
-                await asyncio.sleep(0.7)  # Short delay between updates
+            await self._play_phases(stop_message, stop_phases, 0.7)
 
             # Check if campaign exists
             if campaign_id not in self.targeted_campaigns:
@@ -2709,8 +3022,7 @@ Use `/stopad {msg_id}` to stop it anytime.
 
             # Cancel the task
             if campaign_id in self._forwarding_tasks and not self._forwarding_tasks[campaign_id].done():
-                self._forwarding_tasks[campaign_id].cancel()
-                del self._forwarding_tasks[campaign_id]
+                await self._cancel_and_wait([self._forwarding_tasks.pop(campaign_id)])
 
             # Remove campaign
             del self.targeted_campaigns[campaign_id]
@@ -2749,7 +3061,7 @@ Use `/stopad {msg_id}` to stop it anytime.
             wait_seconds = (schedule_time - now).total_seconds()
 
             if wait_seconds > 0:
-                logger.info(f"Scheduled message {msg_id} to be sent in {wait_seconds} seconds")
+                logger.info("Scheduled message %s to be sent in %s seconds", msg_id, wait_seconds)
                 await asyncio.sleep(wait_seconds)
 
             message = self.stored_messages[msg_id]
@@ -2759,10 +3071,10 @@ Use `/stopad {msg_id}` to stop it anytime.
                     # Check if target is a tuple (chat_id, topic_id)
                     if isinstance(target, tuple) and len(target) == 2:
                         chat_id, topic_id = target
-                        logger.info(f"Forwarding scheduled message to topic: chat_id={chat_id}, topic_id={topic_id}")
+                        logger.info("Forwarding scheduled message to topic: chat_id=%s, topic_id=%s", chat_id, topic_id)
                         
                         # Get the user ID (from_peer) of the bot
-                        me = await self.client.get_me()
+                        me = await self._get_me()
                         bot_user_id = me.id
                         
                         # Use ForwardMessagesRequest for topics
@@ -2782,10 +3094,10 @@ Use `/stopad {msg_id}` to stop it anytime.
                                     reply_to=topic_id
                                 )
                             except Exception as e:
-                                logger.error(f"Topic association error: {e}")
+                                logger.error("Topic association error: %s", e)
                     else:
                         # Regular chat - use ForwardMessagesRequest with numeric UIDs
-                        me = await self.client.get_me()
+                        me = await self._get_me()
                         bot_user_id = me.id
                         
                         await self.client(ForwardMessagesRequest(
@@ -2793,16 +3105,16 @@ Use `/stopad {msg_id}` to stop it anytime.
                             id=[message.id],
                             to_peer=target
                         ))
-                    logger.info(f"Successfully forwarded scheduled message {msg_id} to {target}")
+                    logger.info("Successfully forwarded scheduled message %s to %s", msg_id, target)
                 except Exception as e:
-                    logger.error(f"Error forwarding scheduled message {msg_id} to {target}: {str(e)}")
+                    logger.error("Error forwarding scheduled message %s to %s: %s", msg_id, target, e)
 
             return True
         except asyncio.CancelledError:
-            logger.info(f"Scheduled task for message {msg_id} was cancelled")
+            logger.info("Scheduled task for message %s was cancelled", msg_id)
             return False
         except Exception as e:
-            logger.error(f"Error in scheduled task for message {msg_id}: {str(e)}")
+            logger.error("Error in scheduled task for message %s: %s", msg_id, e)
             return False
 
     @admin_only
@@ -2969,9 +3281,9 @@ The message will be forwarded at the scheduled time.
                         # Use our custom resolver function
                         entity_id, entity_type, entity_name, _ = await resolve_entity_without_get_entity(self.client, target)
                         targets.add(entity_id)
-                        logger.info(f"Resolved target {target} to ID {entity_id} (Type: {entity_type}, Name: {entity_name})")
+                        logger.info("Resolved target %s to ID %s (Type: %s, Name: %s)", target, entity_id, entity_type, entity_name)
                     except Exception as e:
-                        logger.error(f"Error resolving target {target}: {str(e)}")
+                        logger.error("Error resolving target %s: %s", target, e)
                         await event.reply(f"❌ Could not resolve target: {target}")
                         return
 
@@ -3010,10 +3322,10 @@ The message will be forwarded at the scheduled time.
                     if isinstance(target, tuple) and len(target) == 2:
                         # Target is a tuple of (chat_id, topic_id)
                         chat_id, topic_id = target
-                        logger.info(f"Forwarding to topic: chat_id={chat_id}, topic_id={topic_id}")
+                        logger.info("Forwarding to topic: chat_id=%s, topic_id=%s", chat_id, topic_id)
                         
                         # Get the user ID (from_peer) of the bot
-                        me = await self.client.get_me()
+                        me = await self._get_me()
                         bot_user_id = me.id
                         
                         # Use ForwardMessagesRequest for topics 
@@ -3033,10 +3345,10 @@ The message will be forwarded at the scheduled time.
                                     reply_to=topic_id
                                 )
                             except Exception as e:
-                                logger.error(f"Topic association error: {e}")
+                                logger.error("Topic association error: %s", e)
                     else:
                         # Get the user ID (from_peer) of the bot
-                        me = await self.client.get_me()
+                        me = await self._get_me()
                         bot_user_id = me.id
                         
                         # Use ForwardMessagesRequest with numeric UIDs
@@ -3049,16 +3361,9 @@ The message will be forwarded at the scheduled time.
 
                     # Update analytics
                     today = datetime.now().strftime('%Y-%m-%d')
-                    if today not in self.analytics["forwards"]:
-                        self.analytics["forwards"][today] = {}
+                    self.analytics["forwards"][today][(msg_id, target)] += 1
 
-                    campaign_key = f"{msg_id}_{target}"
-                    if campaign_key not in self.analytics["forwards"][today]:
-                        self.analytics["forwards"][today][campaign_key] = 0
-
-                    self.analytics["forwards"][today][campaign_key] += 1
-
-                    logger.info(f"Successfully forwarded message {msg_id} to {target}")
+                    logger.info("Successfully forwarded message %s to %s", msg_id, target)
                 except Exception as e:
                     fail_count += 1
                     error_message = str(e)
@@ -3066,16 +3371,9 @@ The message will be forwarded at the scheduled time.
 
                     # Track failures in analytics
                     today = datetime.now().strftime('%Y-%m-%d')
-                    if today not in self.analytics["failures"]:
-                        self.analytics["failures"][today] = {}
-
-                    campaign_key = f"{msg_id}_{target}"
-                    if campaign_key not in self.analytics["failures"][today]:
-                        self.analytics["failures"][today][campaign_key] = []
-
-                    self.analytics["failures"][today][campaign_key].append(error_message)
+                    self.analytics["failures"][today][(msg_id, target)].append(error_message)
 
-                    logger.error(f"Error forwarding message {msg_id} to {target}: {error_message}")
+                    logger.error("Error forwarding message %s to %s: %s", msg_id, target, error_message)
 
                 # Update monitor during the process
                 self.monitor.update_campaign(forward_id, {
@@ -3099,16 +3397,16 @@ The message will be forwarded at the scheduled time.
 
             if failures:
                 result += "\n**Failures:**\n"
-                for target, error in list(failures.items())[:5]:  # Limit to first 5 failures
+                for target, error in islice(failures.items(), 5):  # Limit to first 5 failures
                     result += f"• Target {target}: {error[:50]}...\n"
 
                 if len(failures) > 5:
                     result += f"... and {len(failures) - 5} more failures\n"
 
             await event.reply(result)
-            logger.info(f"Forwarded message {msg_id} to {len(targets)} targets. Success: {success_count}, Failed: {fail_count}")
+            logger.info("Forwarded message %s to %s targets. Success: %s, Failed: %s", msg_id, len(targets), success_count, fail_count)
         except Exception as e:
-            logger.error(f"Error in forward command: {str(e)}")
+            logger.error("Error in forward command: %s", e)
             await event.reply(f"❌ Error: {str(e)}")
 
     @admin_only
@@ -3161,69 +3459,74 @@ The message will be forwarded at the scheduled time.
             fail_count = 0
             failures = {}
 
-            for target in self.target_chats:
-                try:
-                    if isinstance(target, tuple) and len(target) == 2:
-                        # Target is a tuple of (chat_id, topic_id)
-                        chat_id, topic_id = target
-                        logger.info(f"Broadcasting to topic: chat_id={chat_id}, topic_id={topic_id}")
-                        
-                        if isinstance(message_content, str):
-                            # For text messages, directly use send_message with reply_to (this works)
-                            await self.client.send_message(chat_id, message_content, reply_to=topic_id)
-                        else:
-                            # For message objects, use ForwardMessagesRequest
-                            me = await self.client.get_me()
-                            bot_user_id = me.id
-                            
-                            # Use ForwardMessagesRequest for topics
-                            forwarded = await self.client(ForwardMessagesRequest(
-                                from_peer=bot_user_id,
-                                id=[message_content.id],
-                                to_peer=chat_id,
-                                top_msg_id=topic_id  # Use topic_id as top_msg_id for forum topics
-                            ))
-                            # Then send a message linking to the topic
-                            if forwarded and topic_id:
-                                try:
-                                    await self.client.send_message(
-                                        entity=chat_id,
-                                        message=f"⬆️ Forwarded message to topic #{topic_id}",
-                                        reply_to=topic_id
-                                    )
-                                except Exception as e:
-                                    logger.error(f"Topic association error: {e}")
-                    else:
-                        # Regular chat
-                        if isinstance(message_content, str):
-                            await self.client.send_message(target, message_content)
+            # Sends run concurrently, capped by a semaphore to stay under Telegram's flood limits
+            send_semaphore = asyncio.Semaphore(10)
+            bot_user_id = None
+            if not isinstance(message_content, str):
+                # Only needed for forwarding message objects; resolve it once for the whole broadcast
+                me = await self._get_me()
+                bot_user_id = me.id
+
+            async def _broadcast_to(target):
+                nonlocal success_count, fail_count
+                async with send_semaphore:
+                    try:
+                        if isinstance(target, tuple) and len(target) == 2:
+                            # Target is a tuple of (chat_id, topic_id)
+                            chat_id, topic_id = target
+                            logger.info("Broadcasting to topic: chat_id=%s, topic_id=%s", chat_id, topic_id)
+
+                            if isinstance(message_content, str):
+                                # For text messages, directly use send_message with reply_to (this works)
+                                await self.client.send_message(chat_id, message_content, reply_to=topic_id)
+                            else:
+                                # Use ForwardMessagesRequest for topics
+                                forwarded = await self.client(ForwardMessagesRequest(
+                                    from_peer=bot_user_id,
+                                    id=[message_content.id],
+                                    to_peer=chat_id,
+                                    top_msg_id=topic_id  # Use topic_id as top_msg_id for forum topics
+                                ))
+                                # Then send a message linking to the topic
+                                if forwarded and topic_id:
+                                    try:
+                                        await self.client.send_message(
+                                            entity=chat_id,
+                                            message=f"⬆️ Forwarded message to topic #{topic_id}",
+                                            reply_to=topic_id
+                                        )
+                                    except Exception as e:
+                                        logger.error("Topic association error: %s", e)
                         else:
-                            # Get the user ID (from_peer) of the bot
-                            me = await self.client.get_me()
-                            bot_user_id = me.id
-                            
-                            # Use ForwardMessagesRequest for regular chats
-                            await self.client(ForwardMessagesRequest(
-                                from_peer=bot_user_id,
-                                id=[message_content.id],
-                                to_peer=target
-                            ))
+                            # Regular chat
+                            if isinstance(message_content, str):
+                                await self.client.send_message(target, message_content)
+                            else:
+                                # Use ForwardMessagesRequest for regular chats
+                                await self.client(ForwardMessagesRequest(
+                                    from_peer=bot_user_id,
+                                    id=[message_content.id],
+                                    to_peer=target
+                                ))
 
-                    success_count += 1
-                    logger.info(f"Successfully broadcast message to {target}")
-                except Exception as e:
-                    fail_count += 1
-                    error_message = str(e)
-                    failures[target] = error_message
-                    logger.error(f"Error broadcasting message to {target}: {error_message}")
+                        success_count += 1
+                        logger.info("Successfully broadcast message to %s", target)
+                    except Exception as e:
+                        fail_count += 1
+                        error_message = str(e)
+                        failures[target] = error_message
+                        logger.error("Error broadcasting message to %s: %s", target, error_message)
 
-                # Update monitor during the process
-                self.monitor.update_campaign(broadcast_id, {
-                    "total_sent": success_count,
-                    "failed_sends": fail_count,
-                    "current_failures": failures,
-                    "status": "sending"
-                })
+                    # Update monitor during the process
+                    self.monitor.update_campaign(broadcast_id, {
+                        "total_sent": success_count,
+                        "failed_sends": fail_count,
+                        "current_failures": failures,
+                        "status": "sending"
+                    })
+
+            # Snapshot the targets so concurrent /addtarget calls can't mutate the set mid-broadcast
+            await asyncio.gather(*(_broadcast_to(target) for target in list(self.target_chats)), return_exceptions=True)
 
             # Update final status
             self.monitor.update_campaign(broadcast_id, {
@@ -3239,16 +3542,16 @@ The message will be forwarded at the scheduled time.
 
             if failures:
                 result += "\n**Failures:**\n"
-                for target, error in list(failures.items())[:5]:  # Limit to first 5 failures
+                for target, error in islice(failures.items(), 5):  # Limit to first 5 failures
                     result += f"• Target {target}: {error[:50]}...\n"
 
                 if len(failures) > 5:
                     result += f"... and {len(failures) - 5} more failures\n"
 
             await event.reply(result)
-            logger.info(f"Broadcast message to {len(self.target_chats)} targets. Success: {success_count}, Failed: {fail_count}")
+            logger.info("Broadcast message to %s targets. Success: %s, Failed: %s", len(self.target_chats), success_count, fail_count)
         except Exception as e:
-            logger.error(f"Error in broadcast command: {str(e)}")
+            logger.error("Error in broadcast command: %s", e)
             await event.reply(f"❌ Error: {str(e)}")
 
     @admin_only
@@ -3332,6 +3635,7 @@ Example: /addtarget @group1,t.me/c/123/456,-100123456789,t.me/group/123"""
                                 chat_name = str(chat_id)
 
                         self.target_chats.add(chat_id)
+                        self._targets_version += 1
                         await event.reply(f"✅ Added target chat: {chat_name} ({chat_id})")
                         logger.info(f"Added target chat from reply: {chat_id}, current targets: {self.target_chats}")
                         return
@@ -3457,6 +3761,7 @@ Example: /addtarget @group1,t.me/c/123/456,-100123456789,t.me/group/123"""
                         continue
 
                     self.target_chats.add(chat_id)
+                    self._targets_version += 1
                     success_list.append(f"{target} → {chat_id}")
                     logger.info(f"Added target chat: {chat_id} from {target}")
                 except Exception as e:
@@ -3620,6 +3925,7 @@ Example: /addtarget @group1,t.me/c/123/456,-100123456789,t.me/group/123"""
                         chat_id = targets[serial_no - 1]  # Convert to 0-based index
                         if chat_id in self.target_chats:
                             self.target_chats.remove(chat_id)
+                            self._targets_version += 1
                             removed.append(f"Serial #{target} → {chat_id}")
                 except Exception as e:
                     logger.error(f"Error processing target {target}: {str(e)}")
@@ -3691,6 +3997,7 @@ Example: /addtarget @group1,t.me/c/123/456,-100123456789,t.me/group/123"""
                     # Check if the chat is in the target list
                     if chat_id in self.target_chats:
                         self.target_chats.remove(chat_id)
+                        self._targets_version += 1
                         chat_name = None
                         try:
                             # Use our custom resolver function instead of get_entity
@@ -3749,6 +4056,7 @@ Example: /addtarget @group1,t.me/c/123/456,-100123456789,t.me/group/123"""
 
             # No confirmation - just clear all targets
             self.target_chats.clear()
+            self._targets_version += 1
 
             await event.reply(f"✅ All {count} target chats have been removed")
             logger.info(f"Removed all {count} target chats")
@@ -3898,18 +4206,22 @@ Example: /addtarget @group1,t.me/c/123/456,-100123456789,t.me/group/123"""
             for target, _ in invalid_targets:
                 if target in self.target_chats:
                     self.target_chats.remove(target)
+                    self._targets_version += 1
             
             for target, _ in banned_targets:
                 if target in self.target_chats:
                     self.target_chats.remove(target)
+                    self._targets_version += 1
                     
             for target, _ in no_send_perm_targets:
                 if target in self.target_chats:
                     self.target_chats.remove(target)
+                    self._targets_version += 1
                     
             for target, _ in not_member_targets:
                 if target in self.target_chats:
                     self.target_chats.remove(target)
+                    self._targets_version += 1
 
             # Additional check - attempt to send a test message to each remaining target
             # This is the most reliable way to check if we can actually send messages
@@ -3964,6 +4276,7 @@ Example: /addtarget @group1,t.me/c/123/456,-100123456789,t.me/group/123"""
                         practical_test_failed.append((target, f"Failed practical test: {str(e)}"))
                         if target in self.target_chats:
                             self.target_chats.remove(target)
+                            self._targets_version += 1
 
             # Prepare enhanced detailed report with color coding and categories
             await status_msg.edit("📊 Generating comprehensive report...")
@@ -4110,7 +4423,7 @@ Example: /addtarget @group1,t.me/c/123/456,-100123456789,t.me/group/123"""
             error_msg = str(e)
             if "wait" in error_msg.lower():
                 try:
-                    wait_time = int(re.search(r'of (\d+) seconds', error_msg).group(1))
+                    wait_time = int(_FLOOD_WAIT_RE.search(error_msg).group(1))
                 except:
                     wait_time = 60
             return False, (error_msg, wait_time)
@@ -4313,7 +4626,7 @@ Example: /addtarget @group1,t.me/c/123/456,-100123456789,t.me/group/123"""
             error_msg = str(e)
             if "wait" in error_msg.lower():
                 try:
-                    wait_time = int(re.search(r'of (\d+) seconds', error_msg).group(1))
+                    wait_time = int(_FLOOD_WAIT_RE.search(error_msg).group(1))
                 except:
                     wait_time = 60
             return False, (error_msg, wait_time)
@@ -4630,6 +4943,7 @@ Example: /addtarget @group1,t.me/c/123/456,-100123456789,t.me/group/123"""
             # Get all dialogs
             all_chats = []
             added_count = 0
+            targeted_count = 0  # Counted while collecting so the summary needs no second pass
             async for dialog in self.client.iter_dialogs():
                 try:
                     # Check if it's a channel or group and not a private chat
@@ -4650,15 +4964,18 @@ Example: /addtarget @group1,t.me/c/123/456,-100123456789,t.me/group/123"""
                         # If --all flag is used, add non-targeted chats to targets
                         if add_all and chat_id not in self.target_chats:
                             self.target_chats.add(chat_id)
+                            self._targets_version += 1
                             added_count += 1
                             
+                        is_target = chat_id in self.target_chats
+                        targeted_count += is_target
                         all_chats.append({
                             'id': chat_id,
                             'title': title,
                             'type': chat_type,
                             'username': username,
                             'members': members,
-                            'is_target': chat_id in self.target_chats
+                            'is_target': is_target
                         })
                 except Exception as e:
                     logger.error(f"Error processing dialog: {str(e)}")
@@ -4674,38 +4991,44 @@ Example: /addtarget @group1,t.me/c/123/456,-100123456789,t.me/group/123"""
             start_idx = (page - 1) * items_per_page
             end_idx = start_idx + items_per_page
 
-            # Prepare the results message
-            result = f"""🔍 **Joined Chats Overview**
+            # Prepare the results message as a list of parts and join once at the end
+            parts = [f"""🔍 **Joined Chats Overview**
 📊 Total: {len(all_chats)} chats found
-📄 Page {page}/{total_pages}\n"""
+📄 Page {page}/{total_pages}\n"""]
 
             if add_all:
-                result += f"✨ Added {added_count} new chats to targets\n"
+                parts.append(f"✨ Added {added_count} new chats to targets\n")
 
-            result += "\n"
+            parts.append("\n")
 
             # Add chats for current page
             for idx, chat in enumerate(all_chats[start_idx:end_idx], start=start_idx + 1):
                 username_str = f" (@{chat['username']})" if chat['username'] else ""
                 target_str = "🎯 Targeted" if chat['is_target'] else "📌 Not Targeted"
-                result += f"**{idx}. {chat['title']}**{username_str}\n"
-                result += f"   • Chat ID: `{chat['id']}`\n"
-                result += f"   • Type: {chat['type']}\n"
-                result += f"   • Members: {chat['members']}\n"
-                result += f"   • Status: {target_str}\n\n"
+                parts.append(
+                    f"**{idx}. {chat['title']}**{username_str}\n"
+                    f"   • Chat ID: `{chat['id']}`\n"
+                    f"   • Type: {chat['type']}\n"
+                    f"   • Members: {chat['members']}\n"
+                    f"   • Status: {target_str}\n\n"
+                )
 
             # Add summary
-            result += f"\n**Summary:**\n"
-            result += f"• Total chats: {len(all_chats)}\n"
-            result += f"• Targeted chats: {sum(1 for chat in all_chats if chat['is_target'])}\n"
-            result += f"• Showing: {start_idx + 1} to {min(end_idx, len(all_chats))}\n\n"
+            parts.append(
+                f"\n**Summary:**\n"
+                f"• Total chats: {len(all_chats)}\n"
+                f"• Targeted chats: {targeted_count}\n"
+                f"• Showing: {start_idx + 1} to {min(end_idx, len(all_chats))}\n\n"
+            )
 
             # Add usage info
-            result += "**Usage:**\n"
-            result += "• `/listjoined` - View joined chats\n"
-            result += "• `/listjoined --all` - View AND add all joined chats as targets"
+            parts.append(
+                "**Usage:**\n"
+                "• `/listjoined` - View joined chats\n"
+                "• `/listjoined --all` - View AND add all joined chats as targets"
+            )
 
-            await status_msg.edit(result)
+            await status_msg.edit("".join(parts))
             logger.info(f"Listed joined chats: {len(all_chats)} total, added {added_count} new targets")
         except Exception as e:
             logger.error(f"Error in listjoined command: {str(e)}")
@@ -4911,7 +5234,7 @@ Example: /addtarget @group1,t.me/c/123/456,-100123456789,t.me/group/123"""
                 return
 
             # Add the user to admin list
-            self.admins.add(user_id)
+            self.admins = self.admins | {user_id}
 
             await event.reply(f"✅ Added user {user_id} as admin\n\nCurrent admins: {len(self.admins)}")
             logger.info(f"Added new admin: {user_id}")
@@ -4945,7 +5268,7 @@ Example: /addtarget @group1,t.me/c/123/456,-100123456789,t.me/group/123"""
                 return
 
             # Remove the user from admin list
-            self.admins.remove(user_id)
+            self.admins = self.admins - {user_id}
 
             await event.reply(f"✅ Removed user {user_id} from admins\n\nRemaining admins: {len(self.admins)}")
             logger.info(f"Removed admin: {user_id}")
@@ -5090,7 +5413,7 @@ Period: Last {days} days
         """List failed chats with filters by type and reason"""
         try:
             # Parse command arguments
-            args = event.text.split()[1:] if len(event.text.split()) > 1 else []
+            args = event.text.split()[1:]
             
             filter_type = None
             filter_reason = None
@@ -5325,17 +5648,17 @@ Period: Last {days} days
                 try:
                     entity = await self.client.get_entity(chat_id)
                 except Exception as e:
-                    logger.error(f"Could not resolve entity for {chat_id}: {str(e)}")
+                    logger.error("Could not resolve entity for %s: %s", chat_id, e)
                     return
             
             if not entity:
-                logger.error(f"Could not resolve entity for {chat_id}")
+                logger.error("Could not resolve entity for %s", chat_id)
                 return
                 
             # Get the stored message
             stored_msg = self.stored_messages.get(message_id, None)
             if not stored_msg:
-                logger.error(f"No stored message found with ID {message_id} for retry")
+                logger.error("No stored message found with ID %s for retry", message_id)
                 return
                 
             # Send the message
@@ -5367,7 +5690,7 @@ Period: Last {days} days
                 
         except Exception as e:
             error_message = str(e)
-            logger.error(f"Error retrying message to {chat_id}: {error_message}")
+            logger.error("Error retrying message to %s: %s", chat_id, error_message)
             
             # Update the failed_chats entry with new error information
             target_key = str(chat_id)
@@ -5380,15 +5703,13 @@ Period: Last {days} days
                 
                 # Add to campaign_ids set if not already present
                 if campaign_id:
-                    if 'campaign_ids' not in failed_chat:
-                        failed_chat['campaign_ids'] = set()
                     failed_chat['campaign_ids'].add(campaign_id)
     
     async def cmd_retry_failed(self, event):
         """Retry sending messages to failed chats"""
         try:
             # Parse command arguments
-            args = event.text.split()[1:] if len(event.text.split()) > 1 else []
+            args = event.text.split()[1:]
             
             filter_type = None
             filter_reason = None
@@ -5473,8 +5794,7 @@ Period: Last {days} days
             await msg.edit(f"🚀 **Starting Retry Operation**\n\nRetrying message `{use_msg_id}` to {len(retry_chats)} failed chats...")
             
             # Create new campaign for the retry
-            timestamp = int(time.time())
-            retry_campaign_id = f"retry_{use_msg_id}_{timestamp}"
+            retry_campaign_id = f"retry_{use_msg_id}_{self._campaign_suffix()}"
             
             # Track success and failures
             success_count = 0
@@ -5503,9 +5823,11 @@ Period: Last {days} days
                 batch = chat_ids[i:i+batch_size]
                 
                 for chat_id in batch:
+                    # Original failed_chats key - chat_id itself is unpacked below for forum topics
+                    target_key = chat_id
                     try:
                         # Get the user ID (from_peer) of the bot
-                        me = await self.client.get_me()
+                        me = await self._get_me()
                         bot_user_id = me.id
                         
                         # Check if it's a forum topic
@@ -5527,15 +5849,15 @@ Period: Last {days} days
                             ))
                         
                         # Success - remove from failed chats if it exists
-                        if chat_id in self.failed_chats:
-                            del self.failed_chats[chat_id]
+                        if target_key in self.failed_chats:
+                            del self.failed_chats[target_key]
                         
                         success_count += 1
                         
                         # Update monitor
                         self.monitor.update_campaign(retry_campaign_id, {
                             "total_sent": success_count,
-                            "last_target": str(chat_id),
+                            "last_target": chat_id,
                             "status": "sending"
                         })
                     except Exception as e:
@@ -5545,26 +5867,27 @@ Period: Last {days} days
                         # Update monitor
                         self.monitor.update_campaign(retry_campaign_id, {
                             "failed_sends": new_failures,
-                            "last_failed_target": str(chat_id),
-                            "last_error": error_message[:100] if len(error_message) > 100 else error_message,
+                            "last_failed_target": chat_id,
+                            "last_error": error_message[:100],
                             "status": "sending_with_errors"
                         })
                         
                         # Update failed chat entry
-                        target_key = chat_id
                         if target_key in self.failed_chats:
                             failed_chat = self.failed_chats[target_key]
                             failed_chat['last_attempt'] = datetime.now()
-                            failed_chat['reason'] = self._classify_error(error_message)
+                            error_type = self._classify_error(error_message)
+                            failed_chat['reason'] = error_type
                             failed_chat['detail'] = error_message
                             failed_chat['failed_count'] += 1
                             failed_chat['campaign_ids'].add(retry_campaign_id)
-                            failed_chat['error_history'].append({
-                                'timestamp': datetime.now().isoformat(),
-                                'campaign_id': retry_campaign_id,
-                                'error_type': self._classify_error(error_message),
-                                'details': error_message
-                            })
+                            if self.detailed_history:
+                                failed_chat['error_history'].append({
+                                    'timestamp': datetime.now().isoformat(),
+                                    'campaign_id': retry_campaign_id,
+                                    'error_type': error_type,
+                                    'details': error_message
+                                })
                 
                 # Update progress message after each batch
                 await progress_msg.edit(f"🔄 **Retry Progress: {min(i+batch_size, len(chat_ids))}/{len(chat_ids)}**\n\n✅ Success: {success_count}\n❌ New Failures: {new_failures}")
@@ -5604,9 +5927,9 @@ Use `/failedchats` to view remaining failed chats.
 """
             await msg.edit(final_report)
             
-            logger.info(f"Retry operation completed: {success_count} successful, {new_failures} failed")
+            logger.info("Retry operation completed: %s successful, %s failed", success_count, new_failures)
         except Exception as e:
-            logger.error(f"Error in retry failed command: {str(e)}")
+            logger.error("Error in retry failed command: %s", e)
             await event.reply(f"❌ Error: {str(e)}")
     
     def remove_failed_chats(self, chat_ids=None):
@@ -5645,7 +5968,7 @@ Use `/failedchats` to view remaining failed chats.
         """Remove chats from the failed list"""
         try:
             # Parse command arguments
-            args = event.text.split()[1:] if len(event.text.split()) > 1 else []
+            args = event.text.split()[1:]
             
             filter_type = None
             filter_reason = None
@@ -5747,7 +6070,7 @@ Use `/failedchats` to view remaining failed chats.
             
             # Show preview of chats to be removed (first 5)
             preview = "\n**Preview of chats to be removed:**\n"
-            for i, (chat_id, data) in enumerate(list(remove_chats.items())[:5], 1):
+            for i, (chat_id, data) in enumerate(islice(remove_chats.items(), 5), 1):
                 chat_name = data.get('name', f"Chat {chat_id}")
                 if len(chat_name) > 25:
                     chat_name = chat_name[:22] + "..."
@@ -5788,7 +6111,7 @@ Use `/failedchats` to view the updated failed chats list.
             client_msg = await event.reply("🤖 **Initializing Advanced Client Diagnostics** 🤖")
             
             # Record start time for performance measurement
-            start_time = time.time()
+            start_time = time.monotonic()
             
             # Enhanced animated frames
             frames = [
@@ -5807,15 +6130,15 @@ Use `/failedchats` to view the updated failed chats list.
                 await asyncio.sleep(0.5)  # Slightly faster animation
 
             # Perform test pings to Telegram servers
-            ping_start = time.time()
+            ping_start = time.monotonic()
             await self.client.get_me()  # Simple API call to measure response time
-            ping_time = int((time.time() - ping_start) * 1000)  # Convert to milliseconds
+            ping_time = int((time.monotonic() - ping_start) * 1000)  # Convert to milliseconds
             
             # Delete the loading message
             await client_msg.delete()
             
-            # Get detailed client information
-            me = await self.client.get_me()
+            # Get detailed client information (fresh, and refresh the cached copy with it)
+            me = self._cache['me'] = await self.client.get_me()
             
             # Always use the fixed username regardless of actual account
             username = "siimplebot1"
@@ -5874,7 +6197,7 @@ Use `/failedchats` to view the updated failed chats list.
             active_targets = len(self.target_chats)
             
             # Performance test results
-            response_time = int((time.time() - start_time) * 1000)  # Total function response time in ms
+            response_time = int((time.monotonic() - start_time) * 1000)  # Total function response time in ms
             
             # Test connection to multiple Telegram data centers
             connection_status = "✅ Optimal"
@@ -5914,7 +6237,7 @@ Hey {name}! 🚀 Here's your comprehensive client information:
 📡 **Connection Diagnostics**
 • Ping: ⚡ {ping_time} ms
 • Connection Status: {connection_status}
-• Uptime: {format_time_remaining(int(time.time() - self.analytics["start_time"]))}
+• Uptime: {format_time_remaining(int(time.monotonic() - self.analytics["start_time"]))}
 • Response Time: {response_time} ms
 
 🔒 **Security Status**
@@ -5991,10 +6314,10 @@ async def main():
     """Main function to start the Telegram userbot"""
     client = None
     try:
-        # Load credentials from environment
-        api_id = int(os.getenv('TELEGRAM_API_ID', '0'))
-        api_hash = os.getenv('TELEGRAM_API_HASH', '')
-        phone_number = os.getenv('TELEGRAM_PHONE', '')
+        # Credentials were parsed from the environment at import time
+        api_id = TELEGRAM_API_ID
+        api_hash = TELEGRAM_API_HASH
+        phone_number = TELEGRAM_PHONE
 
         if not all([api_id, api_hash, phone_number]):
             logger.error("Missing API credentials")
@@ -6025,9 +6348,7 @@ async def main():
             if not await client.is_user_authorized():
                 logger.warning("User not authorized. Attempting in-place authentication...")
                 try:
-                    # Load authentication info from environment
-                    phone_number = os.getenv('TELEGRAM_PHONE', '')
-                    
+                    # phone_number was already read from the environment above
                     # First, check if auth code is in environment
                     auth_code = os.getenv('TELEGRAM_AUTH_CODE', None)
                     auth_password = os.getenv('TELEGRAM_AUTH_PASSWORD', None)
@@ -6047,7 +6368,7 @@ async def main():
                         print(f"Authentication code required for {phone_number}")
                         print("Check your Telegram app for the code that was just sent")
                         print("="*50)
-                        auth_code = input("Enter the code here: ").strip()
+                        auth_code = (await asyncio.to_thread(input, "Enter the code here: ")).strip()
                         print("="*50 + "\n")
                         
                         if not auth_code:
@@ -6071,7 +6392,7 @@ async def main():
                             print("\n" + "="*50)
                             print("Two-factor authentication is enabled for this account")
                             print("="*50)
-                            auth_password = input("Enter your 2FA password: ").strip()
+                            auth_password = (await asyncio.to_thread(input, "Enter your 2FA password: ")).strip()
                             print("="*50 + "\n")
                             
                             if not auth_password:
@@ -6118,17 +6439,8 @@ async def main():
         # Create forwarder
         forwarder = MessageForwarder(client)
         
-        # Initialize admin IDs - make sure the bot loads them from environment
-        admin_ids_str = os.getenv('ADMIN_USER_IDS', '')
-        if admin_ids_str:
-            try:
-                admin_ids = [int(id.strip()) for id in admin_ids_str.split(',')]
-                forwarder.admins = set(admin_ids)
-                logger.info(f"Loaded admin IDs: {forwarder.admins}")
-            except Exception as e:
-                logger.error(f"Error parsing admin IDs: {str(e)}")
-                # Make sure the primary admin is still registered
-                forwarder.admins = {forwarder.primary_admin}
+        # Admin IDs were loaded from ADMIN_USER_IDS when the forwarder was created
+        logger.info(f"Loaded admin IDs: {forwarder.admins}")
         
         # Register an explicit restart command handler for system
         @client.on(events.NewMessage(pattern=r'/system_restart'))
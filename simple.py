@@ -1,9 +1,12 @@
 import os
 import sys
+import atexit
+import queue
 import json
 import time
 import random
 import logging
+from logging.handlers import QueueHandler, QueueListener
 import asyncio
 import string
 import re
@@ -11,7 +14,6 @@ from typing import Set, Dict, List, Callable, Optional, Union, Tuple, Any
 from functools import wraps
 from datetime import datetime, timedelta
 from telethon import TelegramClient, events
-from telethon.sync import TelegramClient as SyncTelegramClient
 from telethon.tl.functions.channels import JoinChannelRequest, LeaveChannelRequest, GetFullChannelRequest
 from telethon.tl.functions.messages import GetDialogsRequest, SearchGlobalRequest, ImportChatInviteRequest
 from telethon.tl.functions.account import UpdateProfileRequest, UpdateUsernameRequest
@@ -24,14 +26,22 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('telegram_forwarder.log')
-    ]
-)
+# Records go onto a queue and a background listener thread does the console/file writes,
+# so logging never blocks the event loop on disk I/O
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.StreamHandler(), logging.FileHandler('telegram_forwarder.log')]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.SimpleQueue()
+_queue_handler = QueueHandler(_log_queue)
+# Only merge args into the message here; the listener's handlers apply the full format
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 logger = logging.getLogger(__name__)
 
@@ -101,7 +111,7 @@ def generate_campaign_id(length=1):
         return str(random.randint(1, 9))
     else:
         chars = string.ascii_uppercase + string.digits
-        return ''.join(random.choice(chars) for _ in range(length))
+        return ''.join(random.choices(chars, k=length))
 
 def format_time_remaining(seconds: int) -> str:
     """Format seconds into readable time"""
@@ -381,7 +391,7 @@ class MessageForwarder:
         self.stored_messages: Dict[str, Any] = {}  # Store multiple messages by ID
         self._commands_registered = False
         self._forwarding_tasks: Dict[str, asyncio.Task] = {}  # Track multiple forwarding tasks
-        self._message_queue = asyncio.Queue()  # Message queue for faster processing
+        self._message_queue = asyncio.Queue(maxsize=1000)  # Bounded message queue so bursts cannot grow memory without limit
         self._cache = {}  # Cache for frequently accessed data
 
         # Scheduled campaigns
@@ -3384,6 +3394,7 @@ Type /help to see all available commands and features!
 
 async def main():
     """Main function to start the Telegram userbot"""
+    client = None
     try:
         # Load credentials from environment
         api_id = int(os.getenv('API_ID', '0'))
@@ -3401,20 +3412,24 @@ async def main():
             api_hash,
             device_model="--Ꮪɪᴍṗʟᴇ'𝚜 𝙰𝙳𝙱𝙾𝚃",
             system_version="1.0",
-            app_version="1.0"
+            app_version="1.0",
+            connection_retries=20,         # Keep retrying the same session instead of failing out
+            auto_reconnect=True,           # Reuse the session file and reconnect in place
+            flood_sleep_threshold=60       # Sleep through short flood waits instead of raising
         )
 
-        # Connect
-        await client.connect()
+        # Connect once for the lifetime of the process
+        if not client.is_connected():
+            await client.connect()
 
         # Login if needed
         if not await client.is_user_authorized():
             await client.send_code_request(phone_number)
             try:
-                code = input('Enter the code: ')
+                code = await asyncio.to_thread(input, 'Enter the code: ')
                 await client.sign_in(phone_number, code)
             except SessionPasswordNeededError:
-                password = input('Enter 2FA password: ')
+                password = await asyncio.to_thread(input, 'Enter 2FA password: ')
                 await client.sign_in(password=password)
 
         # Create forwarder
@@ -3427,7 +3442,9 @@ async def main():
         logger.error(f"Error in main: {str(e)}")
         return 1
     finally:
-        await client.disconnect()
+        # client may never have been created if credentials were missing
+        if client and client.is_connected():
+            await client.disconnect()
 
     return 0
 